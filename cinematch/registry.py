@@ -0,0 +1,266 @@
+import threading
+import time
+
+from django.conf import settings
+
+
+class ModelNotReady(Exception):
+    pass
+
+
+class LazyModel:
+    """
+    A model that is loaded on first use instead of at import time.
+
+    Web processes start loading every registered model in a background
+    thread at boot (see warm_up_models). Anywhere else, such as a
+    management command, the model is only loaded when get() is first
+    called, so commands that don't need it never pay for it.
+
+    Web processes also run warmup on the freshly loaded model before it is
+    reported ready, so the first real request doesn't pay for tracing or
+    page faults.
+
+    A failed load is not permanent: it is retried with exponential
+    backoff (in the background for web processes, else on the next get()
+    once the backoff passed), so a missing mount or a sentiment server
+    that is not up yet can recover without a restart.
+
+    If changed is given, get() calls changed(model) at most every
+    check_seconds seconds and reloads the model in the background when it
+    returns True. Every process notices a new model on its own that way,
+    not only the one that served the reload request.
+    """
+
+    def __init__(self, name, loader, warmup=None, changed=None,
+                 check_seconds=0):
+        self.name = name
+        self._loader = loader
+        self._warmup = warmup
+        self._changed = changed
+        self._check_seconds = check_seconds
+        self._checked_at = time.monotonic()
+        self._reloading = False
+        self._warming = False
+        self._value = None
+        self._error = None
+        self._started = False
+        self._background = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        # Naik setiap reload, supaya load awal yang selesai belakangan
+        # tidak menimpa model hasil reload
+        self._generation = 0
+        self.load_seconds = None
+        self.warmup_seconds = None
+
+    @property
+    def is_ready(self):
+        return self._loaded.is_set() and self._error is None
+
+    @property
+    def state(self):
+        if self._error is not None:
+            return "failed"
+        if self._loaded.is_set():
+            return "ready"
+        if self._warming:
+            return "warming"
+        if self._started:
+            return "loading"
+        return "not_loaded"
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                if self._error is None or time.monotonic() < self._retry_at:
+                    return False
+                # Percobaan ulang setelah gagal
+                self._error = None
+                self._loaded.clear()
+            self._started = True
+            return True
+
+    def _retry_delay(self):
+        return min(settings.MODEL_LOAD_RETRY_SECONDS * 2 ** (self._failures - 1),
+                   settings.MODEL_LOAD_RETRY_MAX_SECONDS)
+
+    def _warm_up(self, value):
+        if self._warmup is None or not settings.MODEL_WARMUP:
+            return
+        self._warming = True
+        started = time.perf_counter()
+        try:
+            self._warmup(value)
+        except Exception as error:
+            # Warmup yang gagal tidak membuat model tidak bisa dipakai
+            print(f"[{self.name.upper()} MODEL] warmup failed: {error!r}")
+        finally:
+            self._warming = False
+        self.warmup_seconds = time.perf_counter() - started
+        print(f"[{self.name.upper()} MODEL] warmed up "
+              f"in {self.warmup_seconds:.1f}s")
+
+    def _load(self, warm_up=False):
+        print(f"[{self.name.upper()} MODEL] loading")
+        generation = self._generation
+        started = time.perf_counter()
+        try:
+            value = self._loader()
+        except Exception as error:
+            with self._reload_lock:
+                if self._generation != generation:
+                    # Sudah diganti oleh reload yang berhasil
+                    return
+            self._failures += 1
+            delay = self._retry_delay()
+            self._retry_at = time.monotonic() + delay
+            self._error = error
+            print(f"[{self.name.upper()} MODEL] failed: {error!r}, "
+                  f"retrying in {delay:.0f}s")
+            if self._background:
+                retry = threading.Timer(delay, self.load_in_background)
+                retry.daemon = True
+                retry.start()
+        else:
+            self._failures = 0
+            self.load_seconds = time.perf_counter() - started
+            print(f"[{self.name.upper()} MODEL] loaded "
+                  f"in {self.load_seconds:.1f}s")
+            if warm_up:
+                self._warm_up(value)
+            with self._reload_lock:
+                if self._generation == generation:
+                    self._value = value
+                else:
+                    print(f"[{self.name.upper()} MODEL] discarded, "
+                          f"already reloaded")
+        finally:
+            self._loaded.set()
+
+    def _spawn_load(self):
+        threading.Thread(
+            target=self._load,
+            kwargs={"warm_up": True},
+            name=f"load-{self.name}-model",
+            daemon=True,
+        ).start()
+
+    def load_in_background(self):
+        self._background = True
+        if self._start():
+            self._spawn_load()
+
+    def get(self, timeout=None):
+        """
+        Return the loaded model. If nobody started loading it yet, load
+        it in this thread. If it is loading in the background, wait up to
+        timeout seconds and raise ModelNotReady if it is still not there.
+        """
+        if self._start():
+            if self._background:
+                self._spawn_load()
+            else:
+                self._load()
+        if not self._loaded.wait(timeout):
+            raise ModelNotReady(f"{self.name} model is still loading")
+        if self._error is not None:
+            raise ModelNotReady(f"{self.name} model failed to load") \
+                from self._error
+        value = self._value
+        self._check_changed(value)
+        return value
+
+    def _check_changed(self, value):
+        if self._changed is None or self._check_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._reloading or now < self._checked_at + self._check_seconds:
+                return
+            self._checked_at = now
+            self._reloading = True
+        try:
+            changed = self._changed(value)
+        except Exception as error:
+            print(f"[{self.name.upper()} MODEL] change check failed: "
+                  f"{error!r}")
+            changed = False
+        if not changed:
+            self._reloading = False
+            return
+        # Request ini tetap dilayani model lama, reload jalan di background
+        threading.Thread(
+            target=self._reload_changed,
+            name=f"reload-{self.name}-model",
+            daemon=True,
+        ).start()
+
+    def _reload_changed(self):
+        try:
+            self.reload()
+        except Exception as error:
+            print(f"[{self.name.upper()} MODEL] reload failed, still "
+                  f"serving the old model: {error!r}")
+        finally:
+            self._reloading = False
+
+    def reload(self, loader=None):
+        """
+        Load a fresh copy next to the current one, then swap the single
+        reference to it. Requests already holding the old model finish on
+        it, and if loading fails the old model keeps being served.
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            value = (loader or self._loader)()
+            self.load_seconds = time.perf_counter() - started
+            self._warm_up(value)
+            self._generation += 1
+            self._value = value
+            self._error = None
+            self._started = True
+            self._loaded.set()
+            print(f"[{self.name.upper()} MODEL] reloaded "
+                  f"in {self.load_seconds:.1f}s")
+            return value
+
+    def get_if_ready(self):
+        if self.is_ready:
+            return self._value
+        return None
+
+
+MODELS = {}
+
+
+def register(name, loader, warmup=None, changed=None, check_seconds=0):
+    MODELS[name] = LazyModel(name, loader, warmup, changed, check_seconds)
+    return MODELS[name]
+
+
+def warm_up_models():
+    """
+    Start loading every registered model in the background. Called once
+    by the WSGI entry point, so only web processes do this.
+    """
+    for model in MODELS.values():
+        model.load_in_background()
+
+
+def models_status():
+    return {
+        name: {
+            "state": model.state,
+            "load_seconds": model.load_seconds,
+            "warmup_seconds": model.warmup_seconds,
+        }
+        for name, model in MODELS.items()
+    }
+
+
+def all_ready():
+    return all(model.is_ready for model in MODELS.values())
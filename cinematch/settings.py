@@ -196,6 +196,113 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
+# ML models
+# Seconds a request waits for a model that is still loading in the
+# background before giving up with a 503
+MODEL_LOAD_TIMEOUT = float(os.environ.get("MODEL_LOAD_TIMEOUT", 30))
+
+# A model that failed to load is retried after RETRY_SECONDS, doubling up
+# to RETRY_MAX_SECONDS between attempts
+MODEL_LOAD_RETRY_SECONDS = float(os.environ.get("MODEL_LOAD_RETRY_SECONDS", 10))
+MODEL_LOAD_RETRY_MAX_SECONDS = float(os.environ.get("MODEL_LOAD_RETRY_MAX_SECONDS", 300))
+
+# Web processes run dummy inputs through each model at these batch sizes
+# (and page in the recommendation features) before reporting ready
+MODEL_WARMUP = os.environ.get("MODEL_WARMUP", "True") == "True"
+MODEL_WARMUP_BATCH_SIZES = [
+    int(size) for size in os.environ.get("MODEL_WARMUP_BATCH_SIZES", "1,8,32").split(",")
+]
+
+# Sentiment scoring
+# Concurrent reviews are scored together, up to MAX_BATCH_SIZE reviews or
+# MAX_WAIT_MS after the first one. A batch size of 1 disables batching.
+SENTIMENT_MAX_BATCH_SIZE = int(os.environ.get("SENTIMENT_MAX_BATCH_SIZE", 16))
+SENTIMENT_MAX_WAIT_MS = float(os.environ.get("SENTIMENT_MAX_WAIT_MS", 5))
+
+# When True, reviews are saved as PENDING and scored by a background
+# worker pool instead of during the request
+SENTIMENT_ASYNC_SCORING = os.environ.get("SENTIMENT_ASYNC_SCORING", False) == "True"
+SENTIMENT_WORKER_THREADS = int(os.environ.get("SENTIMENT_WORKER_THREADS", 2))
+SENTIMENT_WORKER_BATCH_SIZE = int(os.environ.get("SENTIMENT_WORKER_BATCH_SIZE", 32))
+SENTIMENT_WORKER_POLL_SECONDS = float(os.environ.get("SENTIMENT_WORKER_POLL_SECONDS", 5))
+
+# Scores are cached by normalized text and model version, in memory (up to
+# CACHE_SIZE texts) and in the rating_sentimentscore table
+SENTIMENT_CACHE_SIZE = int(os.environ.get("SENTIMENT_CACHE_SIZE", 10000))
+
+# Path of the Unix socket of `manage.py run_sentiment_server`. When set, web
+# processes send reviews to that server instead of loading the model
+SENTIMENT_SERVER_SOCKET = os.environ.get("SENTIMENT_SERVER_SOCKET")
+SENTIMENT_SERVER_TIMEOUT = float(os.environ.get("SENTIMENT_SERVER_TIMEOUT", 30))
+# Seconds a web process waits for the server to come up before reporting
+# the model as failed (it is then retried, see MODEL_LOAD_RETRY_SECONDS)
+SENTIMENT_SERVER_CONNECT_WAIT = float(os.environ.get("SENTIMENT_SERVER_CONNECT_WAIT", 120))
+
+# Recommendations
+# Pin a model version directory under recommendations/similarity_model/,
+# by default the one named in its CURRENT file is used
+RECOMMENDATIONS_MODEL_VERSION = os.environ.get("RECOMMENDATIONS_MODEL_VERSION")
+# Every web process checks this often (seconds) whether CURRENT points at
+# another version or the model files changed, and reloads if so. 0 turns
+# the check off, leaving only POST /recommendations/reload/
+RECOMMENDATIONS_MODEL_CHECK_SECONDS = float(
+    os.environ.get("RECOMMENDATIONS_MODEL_CHECK_SECONDS", 30)
+)
+
+# "exact" scores the whole catalog, "ivf" uses the approximate index built
+# with `manage.py build_ann_index`. NPROBE is the number of clusters
+# searched per query, higher means better recall but slower.
+RECOMMENDATIONS_SEARCH_BACKEND = os.environ.get(
+    "RECOMMENDATIONS_SEARCH_BACKEND", "exact"
+)
+RECOMMENDATIONS_IVF_NPROBE = max(
+    1, int(os.environ.get("RECOMMENDATIONS_IVF_NPROBE", 8))
+)
+
+# Per-user recommendation cache (number of entries, seconds)
+RECOMMENDATIONS_CACHE_SIZE = int(os.environ.get("RECOMMENDATIONS_CACHE_SIZE", 1024))
+RECOMMENDATIONS_CACHE_TTL = int(os.environ.get("RECOMMENDATIONS_CACHE_TTL", 3600))
+
+
+# TMDB
+# Seconds to connect and to wait for a response, and how many times a
+# 429/5xx response or failed connect is retried (backoff doubles from
+# RETRY_BACKOFF seconds). Read timeouts are not retried.
+TMDB_CONNECT_TIMEOUT = float(os.environ.get("TMDB_CONNECT_TIMEOUT", 3.05))
+TMDB_READ_TIMEOUT = float(os.environ.get("TMDB_READ_TIMEOUT", 10))
+TMDB_RETRIES = int(os.environ.get("TMDB_RETRIES", 2))
+TMDB_RETRY_BACKOFF = float(os.environ.get("TMDB_RETRY_BACKOFF", 0.5))
+# Longest wait before a retry, also caps TMDB's Retry-After header so a
+# 429 cannot hold a request past its timeout or deadline
+TMDB_BACKOFF_MAX = float(os.environ.get("TMDB_BACKOFF_MAX", 1))
+TMDB_POOL_SIZE = int(os.environ.get("TMDB_POOL_SIZE", 16))
+
+# Threads shared by concurrent TMDB lookups (e.g. the credits of every
+# search result), and how long a search waits for them before returning
+# the results it has
+TMDB_FANOUT_THREADS = int(os.environ.get("TMDB_FANOUT_THREADS", 16))
+TMDB_SEARCH_DEADLINE = float(os.environ.get("TMDB_SEARCH_DEADLINE", 3))
+TMDB_HOME_DEADLINE = float(os.environ.get("TMDB_HOME_DEADLINE", 3))
+
+# Responses are cached per endpoint kind for these many seconds, then served
+# stale for up to STALE_SECONDS more while they are refreshed in the
+# background. CACHE_SIZE bounds the in-process LRU (0 disables caching).
+# Set CACHE_BACKEND to a CACHES alias to share entries between workers.
+TMDB_CACHE_TTLS = {
+    "details": int(os.environ.get("TMDB_CACHE_TTL_DETAILS", 24 * 3600)),
+    "credits": int(os.environ.get("TMDB_CACHE_TTL_CREDITS", 24 * 3600)),
+    "lists": int(os.environ.get("TMDB_CACHE_TTL_LISTS", 3600)),
+    "search": int(os.environ.get("TMDB_CACHE_TTL_SEARCH", 600)),
+    "other": 0,
+}
+TMDB_CACHE_STALE_SECONDS = int(os.environ.get("TMDB_CACHE_STALE_SECONDS", 24 * 3600))
+TMDB_CACHE_SIZE = int(os.environ.get("TMDB_CACHE_SIZE", 2048))
+TMDB_CACHE_BACKEND = os.environ.get("TMDB_CACHE_BACKEND")
+
+# Seconds between refreshes of the popular and top rated snapshots served
+# on the home page
+TMDB_LIST_REFRESH_SECONDS = int(os.environ.get("TMDB_LIST_REFRESH_SECONDS", 3600))
+
 # Google Cloud Storage Bucket
 
 STORAGES = {
@@ -17,8 +17,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from .views import ready, metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("health/ready", ready, name="health-ready"),
+    path("health/metrics", metrics, name="health-metrics"),
     path("user/", include('user.urls')),
-    path("movies/", include('movie.urls'))
+    path("movies/", include('movie.urls')),
+    path("recommendations/", include('recommendations.urls')),
 ]
@@ -0,0 +1,39 @@
+from rest_framework import status
+from rest_framework.decorators import (
+        api_view,
+        authentication_classes,
+        permission_classes,
+)
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+
+from movie.snapshots import MOVIE_LIST_SNAPSHOTS
+from movie.tmdb import TMDB
+from rating.cache import SENTIMENT_CACHE
+from rating.service import SENTIMENT_BATCHER
+from .registry import all_ready, models_status
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def ready(request):
+    """
+    Readiness probe, only returns 200 once every ML model is loaded.
+    """
+    is_ready = all_ready()
+    return Response({
+        "ready": is_ready,
+        "models": models_status(),
+    }, status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return Response({
+        "sentiment_batching": SENTIMENT_BATCHER.metrics(),
+        "sentiment_cache": SENTIMENT_CACHE.metrics(),
+        "tmdb_cache": TMDB.cache.metrics() if TMDB.cache else None,
+        "tmdb_lists": MOVIE_LIST_SNAPSHOTS.metrics(),
+    }, status.HTTP_200_OK)
@@ -15,3 +15,23 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cinematch.settings")
 
 application = get_wsgi_application()
+
+# Only web processes import this module, so management commands never
+# load the ML models. Start loading them now so the first requests don't
+# have to.
+from django.conf import settings  # noqa: E402
+from cinematch.registry import warm_up_models  # noqa: E402
+
+warm_up_models()
+
+# Popular and top rated lists for the home page are refreshed in the
+# background instead of being fetched from TMDB per request
+from movie.snapshots import MOVIE_LIST_SNAPSHOTS  # noqa: E402
+
+MOVIE_LIST_SNAPSHOTS.start()
+
+if settings.SENTIMENT_ASYNC_SCORING:
+    # Also picks up reviews left PENDING by the previous process
+    from rating.worker import REVIEW_SCORING_WORKER
+
+    REVIEW_SCORING_WORKER.start()
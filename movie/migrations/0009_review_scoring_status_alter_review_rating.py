@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:41
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movie", "0008_blendedplaylist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="scoring_status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "PENDING"),
+                    ("SCORED", "SCORED"),
+                    ("FAILED", "FAILED"),
+                ],
+                default="SCORED",
+                max_length=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="rating",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0.0),
+                    django.core.validators.MaxValueValidator(1.0),
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+def merge_duplicate_movies(apps, schema_editor):
+    """
+    Keep the oldest Movie of every tmdb_id and move the playlist entries
+    and reviews of its duplicates onto it, so tmdb_id can become unique
+    in the next migration. Entries that would then be duplicated
+    themselves are dropped, together with the activity of dropped reviews.
+    """
+    Movie = apps.get_model("movie", "Movie")
+    PlaylistMovie = apps.get_model("movie", "PlaylistMovie")
+    Review = apps.get_model("movie", "Review")
+    UserActivity = apps.get_model("user", "UserActivity")
+    UserTasteVector = apps.get_model("recommendations", "UserTasteVector")
+    UserRecommendation = apps.get_model("recommendations", "UserRecommendation")
+
+    duplicated = (
+        Movie.objects.values("tmdb_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .values_list("tmdb_id", flat=True)
+    )
+    affected_users = set()
+    for tmdb_id in list(duplicated):
+        movies = list(Movie.objects.filter(tmdb_id=tmdb_id).order_by("created_at"))
+        kept, duplicates = movies[0], movies[1:]
+        for movie in duplicates:
+            affected_users.update(PlaylistMovie.objects.filter(
+                movie=movie
+            ).values_list("playlist__user_id", flat=True))
+            PlaylistMovie.objects.filter(
+                movie=movie,
+                playlist__in=PlaylistMovie.objects.filter(
+                    movie=kept
+                ).values("playlist"),
+            ).delete()
+            PlaylistMovie.objects.filter(movie=movie).update(movie=kept)
+
+            colliding = Review.objects.filter(
+                movie=movie,
+                user__in=Review.objects.filter(movie=kept).values("user"),
+            )
+            UserActivity.objects.filter(
+                review_id__in=list(colliding.values_list("id", flat=True))
+            ).delete()
+            colliding.delete()
+            Review.objects.filter(movie=movie).update(movie=kept)
+            movie.delete()
+
+        scored = Review.objects.filter(movie=kept, scoring_status="SCORED")
+        aggregates = scored.aggregate(
+            rating=models.Avg("rating"),
+            count=models.Count("id"),
+        )
+        kept.rating = aggregates["rating"] or 0.0
+        kept.review_count = aggregates["count"]
+        kept.save(update_fields=["rating", "review_count"])
+
+    # Liked set user ini berubah, taste vector dan rekomendasi yang sudah
+    # dihitung dibuang supaya dihitung ulang saat dibaca
+    UserTasteVector.objects.filter(user_id__in=affected_users).delete()
+    UserRecommendation.objects.filter(user_id__in=affected_users).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movie", "0009_review_scoring_status_alter_review_rating"),
+        ("recommendations", "0002_userrecommendation"),
+        ("user", "0008_alter_useractivity_followed_username_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_movies, migrations.RunPython.noop),
+    ]
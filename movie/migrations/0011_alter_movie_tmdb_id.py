@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movie", "0010_merge_duplicate_movies"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="movie",
+            name="tmdb_id",
+            field=models.IntegerField(unique=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("movie", "0011_alter_movie_tmdb_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MovieListSnapshot",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("movies", models.JSONField(default=list)),
+                ("fetched_at", models.DateTimeField()),
+            ],
+        ),
+    ]
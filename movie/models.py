@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.core.validators import MaxValueValidator, MinValueValidator
 import uuid
 
@@ -9,7 +10,7 @@ from user.models import CustomUser
 # Create your models here.
 class Movie(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    tmdb_id = models.IntegerField()
+    tmdb_id = models.IntegerField(unique=True)
     title = models.CharField(max_length=255)
     poster_url = models.URLField()
     description = models.TextField()
@@ -22,6 +23,15 @@ class Movie(models.Model):
     def __str__(self):
         return self.title
 
+    def add_review_rating(self, rating):
+        # update the running average in SQL, so concurrent reviews
+        # don't overwrite each other
+        Movie.objects.filter(pk=self.pk).update(
+            rating=((F('rating') * F('review_count')) + rating)
+            / (F('review_count') + 1),
+            review_count=F('review_count') + 1,
+        )
+
 
 class Playlist(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -59,29 +69,45 @@ class Review(models.Model):
         (NEGATIVE, "NEGATIVE"),
     ]
 
+    PENDING = "PENDING"
+    SCORED = "SCORED"
+    FAILED = "FAILED"
+
+    SCORING_STATUSES = [
+        (PENDING, "PENDING"),
+        (SCORED, "SCORED"),
+        (FAILED, "FAILED"),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(CustomUser, related_name='reviewer', on_delete=models.CASCADE)
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
     description = models.CharField(max_length=280)
-    rating = models.FloatField(validators=[
+    rating = models.FloatField(null=True, blank=True, validators=[
         MinValueValidator(0.0),
         MaxValueValidator(1.0)
     ])
     sentiment = models.CharField(max_length=10, blank=True, choices=SENTIMENT_TYPES)
+    scoring_status = models.CharField(max_length=10, default=SCORED, choices=SCORING_STATUSES)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = [["user", "movie"]]
         ordering = ["-created_at"]
 
-    def save(self, *args, **kwargs):
-        percentage = self.rating * 100
+    @staticmethod
+    def sentiment_for(rating):
+        if rating is None:
+            return ""
+        percentage = rating * 100
         if 60 <= percentage <= 100:
-            self.sentiment = "positive"
+            return "positive"
         elif 40 <= percentage < 60:
-            self.sentiment = "neutral"
-        else:
-            self.sentiment = "negative"
+            return "neutral"
+        return "negative"
+
+    def save(self, *args, **kwargs):
+        self.sentiment = self.sentiment_for(self.rating)
         super(Review, self).save(*args, **kwargs)
 
 
@@ -92,3 +118,16 @@ class BlendedPlaylist(models.Model):
 
     class Meta:
         unique_together = ('playlist', 'second_user')
+
+
+class MovieListSnapshot(models.Model):
+    """
+    Last good copy of a TMDB movie list (popular, top_rated), kept by the
+    background refresher so the home page never waits on TMDB for it.
+    """
+    name = models.CharField(max_length=32, primary_key=True)
+    movies = models.JSONField(default=list)
+    fetched_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} ({self.fetched_at})"
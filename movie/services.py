@@ -0,0 +1,104 @@
+from django.conf import settings
+
+from recommendations.service import catalog_metadata
+from .models import Movie
+from .tmdb import TMDB, fetch_concurrently, find_director, image_url
+
+
+def fetch_movie_details(tmdb_id):
+    # credits ikut di response yang sama, cukup satu request per film
+    return TMDB.movie(tmdb_id, append=("credits",), language="en-US")
+
+
+def movie_from_tmdb(details):
+    """
+    Unsaved Movie built from a /movie/{id}?append_to_response=credits
+    response.
+    """
+    return Movie(
+        tmdb_id=details["id"],
+        title=details["title"],
+        poster_url=image_url(details['poster_path']),
+        description=details["overview"],
+        director=find_director(details.get('credits', {}).get('crew', [])),
+        release_date=details["release_date"],
+        rating=0.0,
+    )
+
+
+def ensure_movies(tmdb_ids):
+    """
+    Make sure every movie in tmdb_ids has a Movie row and return a
+    {tmdb_id: Movie} map.
+
+    Existing rows are found with one query, the missing movies are fetched
+    from TMDB concurrently and inserted with one bulk_create. Movies TMDB
+    could not return are left out of the map.
+    """
+    tmdb_ids = list(dict.fromkeys(int(tmdb_id) for tmdb_id in tmdb_ids))
+    movies = {
+        movie.tmdb_id: movie
+        for movie in Movie.objects.filter(tmdb_id__in=tmdb_ids)
+    }
+
+    missing = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id not in movies]
+    if missing:
+        fetched = fetch_concurrently(fetch_movie_details, missing, None)
+        # Request lain bisa saja menyimpan film yang sama duluan
+        Movie.objects.bulk_create(
+            [movie_from_tmdb(details) for details in fetched.values()],
+            ignore_conflicts=True,
+        )
+        # Dengan ignore_conflicts, pk baris yang bentrok tidak bisa
+        # dipercaya, jadi diambil ulang dari database
+        movies.update({
+            movie.tmdb_id: movie
+            for movie in Movie.objects.filter(tmdb_id__in=list(fetched))
+        })
+    return movies
+
+
+def movie_cards(tmdb_ids):
+    """
+    Title and poster of every movie in tmdb_ids, in the same order.
+
+    Looked up in the Movie table first (one query), then in the
+    recommendation catalog, and only the movies found in neither are
+    fetched from TMDB, concurrently. Movies TMDB could not return in time
+    are left out.
+    """
+    tmdb_ids = [int(tmdb_id) for tmdb_id in tmdb_ids]
+    cards = {}
+    for tmdb_id, title, poster_url in Movie.objects.filter(
+            tmdb_id__in=tmdb_ids
+    ).values_list('tmdb_id', 'title', 'poster_url'):
+        cards.setdefault(tmdb_id, {
+            "tmdb_id": tmdb_id,
+            "title": title,
+            "poster_url": poster_url,
+        })
+
+    missing = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id not in cards]
+    for tmdb_id, metadata in catalog_metadata(missing).items():
+        cards[tmdb_id] = {
+            "tmdb_id": tmdb_id,
+            "title": metadata["title"],
+            "poster_url": image_url(metadata["poster_path"]),
+        }
+
+    missing = [tmdb_id for tmdb_id in missing if tmdb_id not in cards]
+    if missing:
+        deadline = settings.TMDB_HOME_DEADLINE
+        fetched = fetch_concurrently(
+            lambda tmdb_id: TMDB.movie(tmdb_id, timeout=deadline),
+            missing,
+            deadline,
+        )
+        for tmdb_id, movie in fetched.items():
+            cards[tmdb_id] = {
+                "tmdb_id": movie["id"],
+                "title": movie["title"],
+                "poster_url": image_url(movie['poster_path']),
+            }
+
+    return [cards[tmdb_id] for tmdb_id in tmdb_ids if tmdb_id in cards]
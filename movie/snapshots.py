@@ -0,0 +1,178 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+
+from .models import MovieListSnapshot
+from .tmdb import TMDB, image_url
+
+LISTS = {
+    "popular": "movie/popular",
+    "top_rated": "movie/top_rated",
+}
+
+
+def movie_list_cards(path):
+    return [
+        {
+            "tmdb_id": movie["id"],
+            "title": movie["title"],
+            "poster_url": image_url(movie['poster_path']),
+        }
+        for movie in TMDB.fetch(path)["results"]
+    ]
+
+
+class MovieListSnapshots:
+    """
+    Local snapshots of the TMDB lists that are the same for every visitor.
+
+    A background thread refetches every list each interval seconds and
+    keeps the result in memory and in the MovieListSnapshot table, so new
+    processes start from the last snapshot. Reading a list never calls
+    TMDB unless no snapshot exists at all yet, and a failed refresh keeps
+    serving the last good one. Without any snapshot, only one request per
+    list fetches it and the others wait for that request.
+    """
+
+    def __init__(self, lists, interval):
+        self.lists = lists
+        self.interval = interval
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._first_fetch_locks = {name: threading.Lock() for name in lists}
+        self._thread = None
+        self._failures = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="movie-list-refresher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        self._load_persisted()
+        while True:
+            try:
+                for name in self.lists:
+                    if self._age(name) >= self.interval:
+                        self.refresh(name)
+            except Exception as error:
+                print(f"[MOVIE LISTS] refresh loop failed: {error!r}")
+            finally:
+                close_old_connections()
+            # List yang gagal di-refresh dicoba lagi paling cepat semenit
+            # kemudian, supaya TMDB yang sedang down tidak dibanjiri request
+            time.sleep(max(
+                min(self.interval - self._age(name) for name in self.lists),
+                min(60, self.interval),
+            ))
+
+    def _snapshot(self, name):
+        with self._lock:
+            return self._snapshots.get(name)
+
+    def _age(self, name):
+        snapshot = self._snapshot(name)
+        if snapshot is None:
+            return float("inf")
+        return (timezone.now() - snapshot["fetched_at"]).total_seconds()
+
+    def _load_persisted(self):
+        try:
+            persisted = list(MovieListSnapshot.objects.filter(
+                    name__in=list(self.lists)
+            ))
+        except DatabaseError as error:
+            print(f"[MOVIE LISTS] could not read snapshots: {error!r}")
+            return
+        with self._lock:
+            for snapshot in persisted:
+                self._snapshots.setdefault(snapshot.name, {
+                    "movies": snapshot.movies,
+                    "fetched_at": snapshot.fetched_at,
+                })
+
+    def refresh(self, name):
+        """
+        Fetch one list from TMDB and store it. Returns False, keeping the
+        last snapshot, if TMDB fails.
+        """
+        try:
+            movies = movie_list_cards(self.lists[name])
+        except Exception as error:
+            with self._lock:
+                self._failures += 1
+            print(f"[MOVIE LISTS] {name} refresh failed: {error!r}")
+            return False
+
+        fetched_at = timezone.now()
+        with self._lock:
+            self._snapshots[name] = {
+                "movies": movies,
+                "fetched_at": fetched_at,
+            }
+        try:
+            MovieListSnapshot.objects.update_or_create(
+                name=name,
+                defaults={"movies": movies, "fetched_at": fetched_at},
+            )
+        except DatabaseError as error:
+            print(f"[MOVIE LISTS] could not save {name}: {error!r}")
+        return True
+
+    def get(self, name):
+        """
+        Cards (tmdb_id, title, poster_url) of the last snapshot of a list.
+        """
+        snapshot = self._snapshot(name)
+        if snapshot is None:
+            snapshot = self._first_fetch(name)
+        if snapshot is None:
+            return []
+        return snapshot["movies"]
+
+    def _first_fetch(self, name):
+        # Belum ada snapshot sama sekali (refresher belum jalan), ambil
+        # dari database atau langsung dari TMDB, oleh satu request saja
+        lock = self._first_fetch_locks[name]
+        if lock.acquire(blocking=False):
+            try:
+                if self._snapshot(name) is None:
+                    self._load_persisted()
+                if self._snapshot(name) is None:
+                    self.refresh(name)
+            finally:
+                lock.release()
+        else:
+            # Request lain sedang mengambilnya, tunggu hasilnya saja
+            with lock:
+                pass
+        return self._snapshot(name)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "interval": self.interval,
+                "refresh_failures": self._failures,
+                "lists": {
+                    name: {
+                        "movies": len(snapshot["movies"]),
+                        "fetched_at": snapshot["fetched_at"].isoformat(),
+                    }
+                    for name, snapshot in self._snapshots.items()
+                },
+            }
+
+
+MOVIE_LIST_SNAPSHOTS = MovieListSnapshots(
+    LISTS,
+    interval=settings.TMDB_LIST_REFRESH_SECONDS,
+)
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timezone
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE = [
+    ("movie", "0009_review_scoring_status_alter_review_rating"),
+    ("recommendations", "0002_userrecommendation"),
+    ("user", "0008_alter_useractivity_followed_username_and_more"),
+]
+AFTER = [("movie", "0011_alter_movie_tmdb_id")]
+
+
+class MergeDuplicateMoviesMigrationTests(TransactionTestCase):
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def create_movie(self, apps, created_at):
+        movie = apps.get_model("movie", "Movie").objects.create(
+            tmdb_id=550,
+            title="Fight Club",
+            poster_url="https://image.tmdb.org/t/p/original/fc.jpg",
+            description="",
+            director="David Fincher",
+            release_date=date(1999, 10, 15),
+            rating=0.0,
+        )
+        apps.get_model("movie", "Movie").objects.filter(
+                pk=movie.pk
+        ).update(created_at=created_at)
+        return movie
+
+    def test_merges_duplicates_into_oldest_movie(self):
+        apps = self.migrate(BEFORE)
+        CustomUser = apps.get_model("user", "CustomUser")
+        Playlist = apps.get_model("movie", "Playlist")
+        PlaylistMovie = apps.get_model("movie", "PlaylistMovie")
+        Review = apps.get_model("movie", "Review")
+        UserActivity = apps.get_model("user", "UserActivity")
+        UserTasteVector = apps.get_model("recommendations", "UserTasteVector")
+        UserRecommendation = apps.get_model("recommendations",
+                                            "UserRecommendation")
+
+        alice = CustomUser.objects.create(username="alice")
+        bob = CustomUser.objects.create(username="bob")
+        carol = CustomUser.objects.create(username="carol")
+        kept = self.create_movie(apps, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        duplicate = self.create_movie(
+            apps, datetime(2024, 2, 1, tzinfo=timezone.utc)
+        )
+
+        # alice punya keduanya, bob hanya duplikatnya
+        alice_playlist = Playlist.objects.create(title="Favorite", user=alice)
+        bob_playlist = Playlist.objects.create(title="Favorite", user=bob)
+        PlaylistMovie.objects.create(playlist=alice_playlist, movie=kept)
+        PlaylistMovie.objects.create(playlist=alice_playlist, movie=duplicate)
+        PlaylistMovie.objects.create(playlist=bob_playlist, movie=duplicate)
+
+        Review.objects.create(user=alice, movie=kept, description="great",
+                              rating=4.0)
+        dropped = Review.objects.create(user=alice, movie=duplicate,
+                                        description="meh", rating=2.0)
+        Review.objects.create(user=bob, movie=duplicate, description="loved it",
+                              rating=5.0)
+        UserActivity.objects.create(
+            description="alice reviewed Fight Club",
+            username=alice,
+            movie_tmdb_id=550,
+            review_id=dropped.id,
+            type="REVIEWED_MOVIE",
+        )
+
+        for user in (alice, bob, carol):
+            UserTasteVector.objects.create(user=user, vector_sum=b"",
+                                           model_version="v1")
+            UserRecommendation.objects.create(user=user, fingerprint="f")
+
+        apps = self.migrate(AFTER)
+        Movie = apps.get_model("movie", "Movie")
+        PlaylistMovie = apps.get_model("movie", "PlaylistMovie")
+        Review = apps.get_model("movie", "Review")
+        UserActivity = apps.get_model("user", "UserActivity")
+        UserTasteVector = apps.get_model("recommendations", "UserTasteVector")
+        UserRecommendation = apps.get_model("recommendations",
+                                            "UserRecommendation")
+
+        self.assertEqual(
+            list(Movie.objects.filter(tmdb_id=550).values_list("id", flat=True)),
+            [kept.id],
+        )
+        self.assertEqual(
+            sorted(PlaylistMovie.objects.values_list(
+                    "playlist__user__username", "movie_id"
+            )),
+            [("alice", kept.id), ("bob", kept.id)],
+        )
+        self.assertEqual(
+            sorted(Review.objects.values_list(
+                    "user__username", "movie_id", "rating"
+            )),
+            [("alice", kept.id, 4.0), ("bob", kept.id, 5.0)],
+        )
+        self.assertFalse(UserActivity.objects.filter(
+                review_id=dropped.id
+        ).exists())
+
+        movie = Movie.objects.get(pk=kept.pk)
+        self.assertEqual(movie.rating, 4.5)
+        self.assertEqual(movie.review_count, 2)
+
+        self.assertEqual(
+            list(UserTasteVector.objects.values_list(
+                    "user__username", flat=True
+            )),
+            ["carol"],
+        )
+        self.assertEqual(
+            list(UserRecommendation.objects.values_list(
+                    "user__username", flat=True
+            )),
+            ["carol"],
+        )
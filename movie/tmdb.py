@@ -0,0 +1,193 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .tmdb_cache import TMDBResponseCache
+
+API_KEY = os.getenv('TMDB_API_KEY')
+TMDB_API_URL = "https://api.themoviedb.org/3"
+TMDB_IMAGE_URL = "https://image.tmdb.org/t/p/original/"
+
+
+class TMDBError(Exception):
+    """
+    TMDB returned an error status, or could not be reached in time.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def image_url(path):
+    return f"{TMDB_IMAGE_URL}{path}"
+
+
+class CappedRetry(Retry):
+    """
+    Retry whose sleep between attempts, from backoff or from a
+    Retry-After header, never exceeds backoff_max seconds. urllib3
+    otherwise sleeps for any Retry-After the server sends.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.backoff_max)
+
+
+class TMDBClient:
+    """
+    TMDB API client shared by every request of this process.
+
+    Connections are kept alive in a pool instead of opening a new TLS
+    connection per call, every call has a connect and read timeout, and
+    429/5xx responses and failed connects are retried a few times with
+    exponential backoff (honouring Retry-After, up to backoff_max seconds
+    per wait). Read timeouts are never retried, so a call waits for at
+    most one read timeout. Responses go through cache, if given.
+    """
+
+    def __init__(self, api_key=API_KEY, base_url=TMDB_API_URL,
+                 timeout=(3.05, 10), retries=2, backoff=0.5, backoff_max=1,
+                 pool_size=16, cache=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache
+
+        retry = CappedRetry(
+            total=retries,
+            # Read timeout tidak diulang, kalau tidak satu panggilan bisa
+            # menunggu (retries + 1) kali read timeout
+            read=0,
+            backoff_factor=backoff,
+            backoff_max=backoff_max,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            # Response terakhir dikembalikan, bukan exception, supaya
+            # status_message dari TMDB tetap bisa dibaca
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "accept": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        })
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path, timeout=None, **params):
+        """
+        GET a TMDB endpoint and return the decoded JSON. Raises TMDBError
+        for non-200 responses, timeouts and connection errors.
+        """
+        if self.cache is None:
+            return self.fetch(path, timeout, **params)
+        return self.cache.get(
+            path,
+            params,
+            lambda: self.fetch(path, timeout, **params),
+        )
+
+    def fetch(self, path, timeout=None, **params):
+        """
+        Like get, but always calls TMDB.
+        """
+        params = {"api_key": self.api_key, **params}
+        try:
+            response = self.session.get(
+                self.url(path),
+                params=params,
+                timeout=timeout or self.timeout,
+            )
+        except requests.RequestException as error:
+            raise TMDBError(f"{error.__class__.__name__}") from error
+
+        if response.status_code != 200:
+            try:
+                message = response.json().get('status_message')
+            except ValueError:
+                message = response.reason
+            raise TMDBError(message, response.status_code)
+        return response.json()
+
+    def movie(self, tmdb_id, append=(), **params):
+        if append:
+            params["append_to_response"] = ",".join(append)
+        return self.get(f"movie/{tmdb_id}", **params)
+
+    def credits(self, tmdb_id, **params):
+        return self.get(f"movie/{tmdb_id}/credits", **params)
+
+    def search(self, query, **params):
+        return self.get("search/movie", query=query, **params)
+
+    def popular(self, **params):
+        return self.get("movie/popular", **params)
+
+    def top_rated(self, **params):
+        return self.get("movie/top_rated", **params)
+
+
+def fetch_concurrently(function, items, deadline):
+    """
+    Call function(item) for every item on the shared TMDB thread pool and
+    return {item: result} for the calls that succeeded within deadline
+    seconds (no limit if deadline is None). Failed and late calls are left
+    out, so callers get partial results instead of waiting on the slowest
+    call.
+    """
+    futures = {FANOUT_POOL.submit(function, item): item for item in items}
+    done, not_done = wait(futures, timeout=deadline)
+    for future in not_done:
+        future.cancel()
+
+    results = {}
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except TMDBError as error:
+            print(f"[TMDB] {futures[future]}: {error}")
+    return results
+
+
+def find_director(crew):
+    for member in crew:
+        if member['job'] == 'Director':
+            return member['name']
+    return ""
+
+
+FANOUT_POOL = ThreadPoolExecutor(
+    max_workers=settings.TMDB_FANOUT_THREADS,
+    thread_name_prefix="tmdb-fanout",
+)
+
+TMDB = TMDBClient(
+    timeout=(settings.TMDB_CONNECT_TIMEOUT, settings.TMDB_READ_TIMEOUT),
+    retries=settings.TMDB_RETRIES,
+    backoff=settings.TMDB_RETRY_BACKOFF,
+    backoff_max=settings.TMDB_BACKOFF_MAX,
+    pool_size=settings.TMDB_POOL_SIZE,
+    cache=TMDBResponseCache(
+        ttls=settings.TMDB_CACHE_TTLS,
+        stale_seconds=settings.TMDB_CACHE_STALE_SECONDS,
+        maxsize=settings.TMDB_CACHE_SIZE,
+        backend=settings.TMDB_CACHE_BACKEND,
+    ) if settings.TMDB_CACHE_SIZE > 0 else None,
+)
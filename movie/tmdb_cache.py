@@ -0,0 +1,156 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import LRUCache
+from django.core.cache import caches
+
+LISTS = "lists"
+DETAILS = "details"
+CREDITS = "credits"
+SEARCH = "search"
+OTHER = "other"
+
+
+def endpoint_kind(path):
+    parts = path.strip('/').split('/')
+    if parts[0] == "search":
+        return SEARCH
+    if parts[0] == "movie" and len(parts) == 2:
+        if parts[1] in ("popular", "top_rated", "now_playing", "upcoming"):
+            return LISTS
+        return DETAILS
+    if parts[0] == "movie" and len(parts) == 3 and parts[2] == "credits":
+        return CREDITS
+    return OTHER
+
+
+class TMDBResponseCache:
+    """
+    TTL + LRU cache of decoded TMDB responses, with stale-while-revalidate.
+
+    Every endpoint kind has its own TTL. An entry older than its TTL but
+    younger than TTL + stale_seconds is still served, and refreshed in the
+    background by a single request. Past that, the caller fetches it again,
+    and if TMDB fails the last entry is served anyway. Entries live in a
+    bounded in-process LRU and, if a Django cache alias is given, in that
+    shared backend too, so every worker can reuse them.
+    """
+
+    def __init__(self, ttls, stale_seconds, maxsize, backend=None):
+        self.ttls = ttls
+        self.stale_seconds = stale_seconds
+        self._entries = LRUCache(maxsize=maxsize)
+        self._backend = caches[backend] if backend else None
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="tmdb-refresh",
+        )
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._errors_served_stale = 0
+
+    @staticmethod
+    def key(path, params):
+        query = "&".join(f"{name}={value}"
+                         for name, value in sorted(params.items()))
+        digest = hashlib.sha1(f"{path}?{query}".encode()).hexdigest()
+        return f"tmdb:{digest}"
+
+    def _ttl(self, path):
+        kind = endpoint_kind(path)
+        return self.ttls.get(kind, self.ttls.get(OTHER, 0))
+
+    def _read(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self._backend is not None:
+            entry = self._backend.get(key)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+        return entry
+
+    def _write(self, key, value, ttl):
+        entry = (time.time(), value)
+        with self._lock:
+            self._entries[key] = entry
+        if self._backend is not None:
+            self._backend.set(key, entry, timeout=ttl + self.stale_seconds)
+
+    def _refresh(self, key, fetch, ttl):
+        try:
+            self._write(key, fetch(), ttl)
+        except Exception as error:
+            print(f"[TMDB CACHE] refresh failed: {error!r}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get(self, path, params, fetch):
+        """
+        Return the cached response of path with params, calling fetch()
+        for it when there is no usable entry.
+        """
+        ttl = self._ttl(path)
+        if ttl <= 0:
+            return fetch()
+
+        key = self.key(path, params)
+        entry = self._read(key)
+        if entry is not None:
+            fetched_at, value = entry
+            age = time.time() - fetched_at
+            if age < ttl:
+                with self._lock:
+                    self._hits += 1
+                return value
+            if age < ttl + self.stale_seconds:
+                with self._lock:
+                    self._stale_hits += 1
+                    refresh = key not in self._refreshing
+                    if refresh:
+                        self._refreshing.add(key)
+                        self._refreshes += 1
+                if refresh:
+                    self._executor.submit(self._refresh, key, fetch, ttl)
+                return value
+
+        with self._lock:
+            self._misses += 1
+        try:
+            value = fetch()
+        except Exception:
+            if entry is None:
+                raise
+            # TMDB sedang bermasalah, pakai data lama daripada error
+            with self._lock:
+                self._errors_served_stale += 1
+            return entry[1]
+        self._write(key, value, ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self._entries.maxsize,
+                "shared_backend": self._backend is not None,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "errors_served_stale": self._errors_served_stale,
+                "hit_rate": ((self._hits + self._stale_hits) / lookups
+                             if lookups else 0.0),
+            }
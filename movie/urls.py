@@ -6,6 +6,7 @@ from .views import (
     PlaylistDetailView,
     ReviewView,
     getReviewDetailById,
+    getReviewScoringStatus,
     HomeView,
     blendPlaylist,
 )
@@ -15,6 +16,7 @@ urlpatterns = [
     path('details/<int:pk>/', MovieDetailTMDBView.as_view(), name='movie-tmdb'),
     path('details/<int:pk>/review/', ReviewView.as_view(), name='review-movie-by-tmdb-id'),
     path('review/<uuid:pk>/', getReviewDetailById, name='review-by-id'),
+    path('review/<uuid:pk>/status/', getReviewScoringStatus, name='review-scoring-status'),
     path('playlists/', PlaylistView.as_view(), name='playlist'),
     path('playlists/<uuid:pk>/', PlaylistDetailView.as_view(), name='playlist-edit'),
     path('home/', HomeView.as_view(), name='home'),
@@ -13,54 +13,45 @@ from .serializers import (
         ReviewSerializer,
         InPlaylistSerializer,
 )
+from cinematch.registry import ModelNotReady
 from rating.service import get_sentiment_score
-from recommendations.service import recommend_movies
+from rating.worker import REVIEW_SCORING_WORKER
+from recommendations.service import recommend_movies, cached_recommend_movies
+from recommendations.taste import taste_vector_lock
+
+from .snapshots import MOVIE_LIST_SNAPSHOTS
+from .services import (
+        ensure_movies,
+        fetch_movie_details,
+        movie_cards,
+        movie_from_tmdb,
+)
+from .tmdb import (
+        TMDB,
+        TMDBError,
+        fetch_concurrently,
+        find_director,
+        image_url,
+)
 
-from requests import get
+from django.conf import settings
 from pycountry import countries, languages
-import os
-
-API_KEY = os.getenv('TMDB_API_KEY')
-TMDB_API_URL = "https://api.themoviedb.org/3"
 
 
 def createMovieFromTMDB(id):
-    headers = {
-            "accept": "application/json",
-            "Authorization": f"Bearer {API_KEY}"
-        }
-
-    url_tmdb_movie_detail = f"{TMDB_API_URL}/movie/{id}?api_key={API_KEY}&language=en-US"
-    response_movie_detail = get(url_tmdb_movie_detail, headers=headers)
-    movie_detail_data = response_movie_detail.json()
-
-    # return 502 if TMDB API is down
-    if (response_movie_detail.status_code in (401, 404) or
-            response_movie_detail.status_code != 200):
+    try:
+        movie_detail_data = fetch_movie_details(id)
+    except TMDBError as error:
+        # return 502 if TMDB API is down
         return Response({
             "error": True,
-            "message": f"TMDB: {response_movie_detail.json().get('status_message')}",
+            "message": f"TMDB: {error}",
         }, status.HTTP_502_BAD_GATEWAY)
 
-    url_tmdb_movie_credits = f"{TMDB_API_URL}/movie/{id}/credits?api_key={API_KEY}"
-    response_movie_credits = get(url_tmdb_movie_credits, headers=headers)
-    movie_credits_data = response_movie_credits.json().get('crew', [])
-
-    for crew in movie_credits_data:
-        if crew['job'] == 'Director':
-            director = crew['name']
-            break
-
-    movie = Movie.objects.create(
-        tmdb_id=movie_detail_data["id"],
-        title=movie_detail_data["title"],
-        poster_url=f"https://image.tmdb.org/t/p/original/{movie_detail_data['poster_path']}",
-        description=movie_detail_data["overview"],
-        director=director,
-        release_date=movie_detail_data["release_date"],
-        rating=0.0
-    )
-    return movie
+    movie = movie_from_tmdb(movie_detail_data)
+    # another request may have saved the same movie in the meantime
+    Movie.objects.bulk_create([movie], ignore_conflicts=True)
+    return Movie.objects.get(tmdb_id=movie.tmdb_id)
 
 
 class MovieView(APIView):
@@ -71,46 +62,35 @@ class MovieView(APIView):
             # if search query is provided, fetch themoviedb api
             search_query = request.GET.get('search')
             if search_query:
-                url = f"{TMDB_API_URL}/search/movie?query={search_query}"
-                headers = {
-                    "accept": "application/json",
-                    "Authorization": f"Bearer {API_KEY}"
-                }
-
-                response = get(url, headers=headers)
-
-                # return 502 if TMDB API is down
-                if (response.status_code in [401, 404]
-                        or response.status_code != 200):
-                    error_message = response.json().get('status_message')
+                try:
+                    movies = TMDB.search(search_query)["results"]
+                except TMDBError as error:
+                    # return 502 if TMDB API is down
                     return Response({
                         "error": True,
-                        "message": f"TMDB :{error_message}",
+                        "message": f"TMDB :{error}",
                     }, status.HTTP_502_BAD_GATEWAY)
 
+                # credits of every result are fetched at the same time,
+                # movies whose lookup misses the deadline get no director
+                deadline = settings.TMDB_SEARCH_DEADLINE
+                credits = fetch_concurrently(
+                        lambda id: TMDB.credits(id, timeout=deadline),
+                        [movie["id"] for movie in movies],
+                        deadline,
+                )
+
                 results = []
-                movies = response.json()["results"]
                 for movie in movies:
                     id = movie["id"]
-                    movie_credits_url = f"{TMDB_API_URL}/movie/{id}" \
-                                        + f"/credits?api_key={API_KEY}"
-                    response_movie_credits = get(
-                            movie_credits_url,
-                            headers=headers
+                    director = find_director(
+                            credits.get(id, {}).get('crew', [])
                     )
-                    movie_credits_data = response_movie_credits.json() \
-                        .get('crew', [])
-
-                    for crew in movie_credits_data:
-                        if crew['job'] == 'Director':
-                            director = crew['name']
-                            break
 
                     results.append({
                         "tmdb_id": id,
                         "title": movie["title"],
-                        "poster_url": "https://image.tmdb.org/t/p/original/"
-                                      + f"{movie['poster_path']}",
+                        "poster_url": image_url(movie['poster_path']),
                         "description": movie["overview"],
                         "director": director,
                         "release_date": movie["release_date"],
@@ -230,29 +210,22 @@ class MovieDetailTMDBView(APIView):
 
     def get(self, request, pk):
         try:
-            headers = {
-                    "accept": "application/json",
-                    "Authorization": f"Bearer {API_KEY}"
-            }
-
-            url = f"{TMDB_API_URL}/movie/{pk}?api_key={API_KEY}&append_to_response=videos,credits,similar"
-            response = get(url, headers=headers)
-
-            # return 502 if TMDB API is down
-            if response.status_code == 404 or response.status_code == 401 or response.status_code != 200:
+            try:
+                movie_details = TMDB.movie(
+                        pk,
+                        append=("videos", "credits", "similar"),
+                )
+            except TMDBError as error:
+                # return 502 if TMDB API is down
                 return Response({
                     "error": True,
-                    "message": f"TMDB :{response.json().get('status_message')} ",
+                    "message": f"TMDB :{error} ",
                 }, status.HTTP_502_BAD_GATEWAY)
 
-            movie_details = response.json()
-
             # Get director
-            movie_credits_data = movie_details.get('credits', {}).get('crew', [])
-            for crew in movie_credits_data:
-                if crew['job'] == 'Director':
-                    director = crew['name']
-                    break
+            director = find_director(
+                    movie_details.get('credits', {}).get('crew', [])
+            )
 
             # Get trailer link
             trailer_link = None
@@ -267,7 +240,7 @@ class MovieDetailTMDBView(APIView):
                 cast.append({
                     "name": actor['name'],
                     "character": actor['character'],
-                    "profile_url": f"https://image.tmdb.org/t/p/original/{actor['profile_path']}",
+                    "profile_url": image_url(actor['profile_path']),
                 })
 
             # Get crew ( name, char, poster )
@@ -276,7 +249,7 @@ class MovieDetailTMDBView(APIView):
                 crew.append({
                     "name": crew_member['name'],
                     "job": crew_member['job'],
-                    "profile_url": f"https://image.tmdb.org/t/p/original/{crew_member['profile_path']}",
+                    "profile_url": image_url(crew_member['profile_path']),
                 })
 
             # Get similar movies
@@ -285,7 +258,7 @@ class MovieDetailTMDBView(APIView):
                 similar_movies.append({
                     "tmdb_id": similar_movie['id'],
                     "title": similar_movie['title'],
-                    "poster_url": f"https://image.tmdb.org/t/p/original/{similar_movie['poster_path']}",
+                    "poster_url": image_url(similar_movie['poster_path']),
                 })
 
             try:
@@ -326,8 +299,8 @@ class MovieDetailTMDBView(APIView):
                 "origin_countries": origin_countries,
                 "languages": language,
                 "genres": genres,
-                "poster_url": f"https://image.tmdb.org/t/p/original/{movie_details['poster_path']}",
-                "backdrop_url": f"https://image.tmdb.org/t/p/original/{movie_details['backdrop_path']}",
+                "poster_url": image_url(movie_details['poster_path']),
+                "backdrop_url": image_url(movie_details['backdrop_path']),
                 "description": movie_details["overview"],
                 "director": director,
                 "release_date": movie_details["release_date"],
@@ -427,6 +400,19 @@ class PlaylistDetailView(APIView):
 
             data = request.data
 
+            # Resolve new movies first, so a TMDB failure leaves the
+            # playlist untouched
+            new_movies = data.get('new_movie_tmdb_id', [])
+            movies = ensure_movies(new_movies)
+            not_found = [movie_id for movie_id in new_movies
+                         if int(movie_id) not in movies]
+            if not_found:
+                # return 502 if TMDB API is down
+                return Response({
+                    "error": True,
+                    "message": f"TMDB: could not fetch movies {not_found}",
+                }, status.HTTP_502_BAD_GATEWAY)
+
             # Update title and description
             playlist.title = data.get('title', playlist.title)
             playlist.description = data.get('description',
@@ -434,18 +420,13 @@ class PlaylistDetailView(APIView):
             playlist.save()
 
             # Add new movies
-            new_movies = data.get('new_movie_tmdb_id', [])
             for movie_id in new_movies:
                 movie_title = ""
-                movie = Movie.objects.filter(tmdb_id=movie_id)
-
-                if movie.exists():
-                    movie = movie.first()
-                else:
-                    movie = createMovieFromTMDB(movie_id)
+                movie = movies[int(movie_id)]
 
-                PlaylistMovie.objects.get_or_create(playlist=playlist,
-                                                    movie=movie)
+                with taste_vector_lock(playlist.user_id):
+                    PlaylistMovie.objects.get_or_create(playlist=playlist,
+                                                        movie=movie)
                 movie_title = movie.title
                 description = f"{request.user} added {movie_title} "
                 activity_type = ""
@@ -469,9 +450,10 @@ class PlaylistDetailView(APIView):
             for movie_id in delete_movies:
                 try:
                     movie = Movie.objects.get(tmdb_id=movie_id)
-                    PlaylistMovie.objects.filter(
-                            playlist=playlist, movie=movie
-                            ).delete()
+                    with taste_vector_lock(playlist.user_id):
+                        PlaylistMovie.objects.filter(
+                                playlist=playlist, movie=movie
+                                ).delete()
                 except Movie.DoesNotExist:
                     continue
 
@@ -551,21 +533,28 @@ class ReviewView(APIView):
             else:
                 movie = createMovieFromTMDB(pk)
             description = request.data['description']
-            sentiment_score = get_sentiment_score(description)
+            if settings.SENTIMENT_ASYNC_SCORING:
+                # scored later by the background worker
+                sentiment_score = None
+                scoring_status = Review.PENDING
+            else:
+                sentiment_score = get_sentiment_score(description)
+                scoring_status = Review.SCORED
 
             serializer = ReviewSerializer(data={
                 'user': request.user.id,
                 'movie': movie.id,
                 'description': description,
                 'rating': sentiment_score,
+                'scoring_status': scoring_status,
             }, context={'request': request})
 
             if serializer.is_valid():
                 serializer.save()
-                movie.rating = ((movie.rating * movie.review_count)
-                                + sentiment_score) / (movie.review_count + 1)
-                movie.review_count += 1
-                movie.save()
+                if scoring_status == Review.SCORED:
+                    movie.add_review_rating(sentiment_score)
+                else:
+                    REVIEW_SCORING_WORKER.notify()
                 description = f"{request.user.username} left a review on {movie.title}"
                 activity_type = "REVIEWED_MOVIE"
                 UserActivity.objects.create(
@@ -578,11 +567,18 @@ class ReviewView(APIView):
                 return Response({
                     "error": False,
                     "data": serializer.data
-                }, status=status.HTTP_201_CREATED)
+                }, status=status.HTTP_201_CREATED
+                    if scoring_status == Review.SCORED
+                    else status.HTTP_202_ACCEPTED)
             return Response({
                 "error": True,
                 "message": serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
+        except ModelNotReady:
+            return Response({
+                "error": True,
+                "message": "Sentiment model is still loading, try again later.",
+            }, status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception:
             return Response({
                 "error": True,
@@ -612,6 +608,32 @@ def getReviewDetailById(request, pk):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def getReviewScoringStatus(request, pk):
+    try:
+        review = Review.objects.get(id=pk)
+        return Response({
+            "error": False,
+            "data": {
+                "id": review.id,
+                "scoring_status": review.scoring_status,
+                "rating": review.rating,
+                "sentiment": review.sentiment,
+            }
+        })
+    except Review.DoesNotExist:
+        return Response({
+            "error": True,
+            "message": "Review not found.",
+        }, status=status.HTTP_404_NOT_FOUND)
+    except Exception:
+        return Response({
+            "error": True,
+            "message": "An error has occurred.",
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class HomeView(APIView):
     permission_classes = (AllowAny,)
 
@@ -624,52 +646,32 @@ class HomeView(APIView):
                 "top_rated": []
             }
             recommendations_available = False
-            if (request.user.is_authenticated
-                and PlaylistMovie.objects.
-                    filter(playlist__user=request.user).exists()):
+            selected_movie_indices = []
+            if request.user.is_authenticated:
                 # get all movies from playlist
-                playlist_movies = PlaylistMovie.objects.filter(
+                selected_movie_indices = list(PlaylistMovie.objects.filter(
                         playlist__user=request.user
-                )
-                selected_movie_indices = [pm.movie.tmdb_id for pm in playlist_movies]
-                recommended_movies = recommend_movies(
-                        selected_movie_indices,
-                        10,
-                )
+                ).values_list('movie__tmdb_id', flat=True))
+            if selected_movie_indices:
+                try:
+                    recommended_movies = cached_recommend_movies(
+                            request.user.id,
+                            selected_movie_indices,
+                            10,
+                    )
+                except ModelNotReady:
+                    # fall back to popular movies while the model loads
+                    recommended_movies = []
                 recommendations_available = bool(recommended_movies)
                 if recommendations_available:
-                    for movie in recommended_movies:
-                        id_tmdb = movie
-                        url = f"{TMDB_API_URL}/movie/{id_tmdb}?api_key={API_KEY}"
-                        headers = {
-                            "accept": "application/json",
-                            "Authorization": f"Bearer {API_KEY}"
-                        }
-                        response = get(url, headers=headers)
-                        movie_detail_data = response.json()
-                        results["recommended"].append({
-                            "tmdb_id": movie_detail_data["id"],
-                            "title": movie_detail_data["title"],
-                            "poster_url": "https://image.tmdb.org/t/p/original/"
-                            + f"{movie_detail_data['poster_path']}",
-                        })
+                    # title and poster come from our own data, TMDB is
+                    # only asked for the movies we know nothing about
+                    results["recommended"] = movie_cards(recommended_movies)
             if not recommendations_available:
-                # popular movie from tmdbtmdb_api_url = "https://api.themoviedb.org/3"
-                url = f"{TMDB_API_URL}/movie/popular?api_key={API_KEY}"
-                headers = {
-                        "accept": "application/json",
-                        "Authorization": f"Bearer {API_KEY}"
-                    }
-                response = get(url, headers=headers)
-
-                movies = response.json()["results"]
-                for movie in movies[:10]:
-                    results["recommended"].append({
-                        "tmdb_id": movie["id"],
-                        "title": movie["title"],
-                        "poster_url": "https://image.tmdb.org/t/p/original/"
-                        + f"{movie['poster_path']}",
-                    })
+                # popular movie from the local tmdb snapshot
+                results["recommended"] = MOVIE_LIST_SNAPSHOTS.get(
+                        "popular"
+                )[:10]
 
             # get friend's liked movies from playlist (is_favorite == True)
             if (request.user.is_authenticated
@@ -739,16 +741,7 @@ class HomeView(APIView):
                         "reviewed_at": review.created_at,
                     })
             # get popular movies geolocation based on user's location from tmdb
-            url = f"{TMDB_API_URL}/movie/top_rated?api_key={API_KEY}"
-            response = get(url, headers=headers)
-            movies = response.json()["results"]
-            for movie in movies:
-                results["top_rated"].append({
-                    "tmdb_id": movie["id"],
-                    "title": movie["title"],
-                    "poster_url": "https://image.tmdb.org/t/p/original/"
-                    + f"{movie['poster_path']}",
-                })
+            results["top_rated"] = MOVIE_LIST_SNAPSHOTS.get("top_rated")
             return Response({
                 "error": False,
                 "data": results
@@ -796,14 +789,15 @@ def blendPlaylist(request, username):
                         playlist=playlist,
                         second_user=second_user
                 )
+                movies = ensure_movies(recommended_movies)
                 for movie_id in recommended_movies:
-                    movie = Movie.objects.filter(tmdb_id=movie_id)
-                    if movie.exists():
-                        movie = movie.first()
-                    else:
-                        movie = createMovieFromTMDB(movie_id)
-                    PlaylistMovie.objects.get_or_create(playlist=playlist,
-                                                        movie=movie)
+                    movie = movies.get(int(movie_id))
+                    if movie is None:
+                        # TMDB tidak mengembalikan film ini, lewati saja
+                        continue
+                    with taste_vector_lock(playlist.user_id):
+                        PlaylistMovie.objects.get_or_create(playlist=playlist,
+                                                            movie=movie)
                 return Response({
                     "error": False,
                     "message": "ok"
@@ -826,6 +820,11 @@ def blendPlaylist(request, username):
             "error": True,
             "message": f"user {username} not found.",
         }, status.HTTP_404_NOT_FOUND)
+    except ModelNotReady:
+        return Response({
+            "error": True,
+            "message": "Recommendation model is still loading, try again later.",
+        }, status.HTTP_503_SERVICE_UNAVAILABLE)
     except Exception:
         return Response({
             "error": True,
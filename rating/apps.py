@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class RatingConfig(AppConfig):
@@ -6,11 +7,32 @@ class RatingConfig(AppConfig):
     name = "rating"
 
     def ready(self):
-        import tensorflow as tf
-        import tensorflow_text as text
+        from functools import partial
 
-        load_options = tf.saved_model.LoadOptions(
-            experimental_io_device='/job:localhost'
-        )
-        path = 'rating/sentiment_model'
-        self.sentiment_model = tf.saved_model.load(path, options=load_options)
+        from cinematch.registry import register
+        from .model import load_sentiment_model, warm_up_sentiment_model
+        from .server import connect_sentiment_server
+
+        if settings.SENTIMENT_SERVER_SOCKET:
+            # Model ada di proses `manage.py run_sentiment_server`, proses
+            # ini cuma jadi client
+            loader = partial(
+                connect_sentiment_server,
+                settings.SENTIMENT_SERVER_SOCKET,
+                timeout=settings.SENTIMENT_SERVER_TIMEOUT,
+                wait=settings.SENTIMENT_SERVER_CONNECT_WAIT,
+            )
+            # Warmup dijalankan oleh sentiment server sendiri
+            warmup = None
+        else:
+            # TensorFlow baru di-import saat model pertama kali dibutuhkan
+            # (atau di background saat web server start)
+            loader = load_sentiment_model
+            warmup = partial(
+                warm_up_sentiment_model,
+                batch_sizes=settings.MODEL_WARMUP_BATCH_SIZES,
+            )
+        self.sentiment_model = register("sentiment", loader, warmup)
+
+    def get_model(self):
+        return self.sentiment_model.get(timeout=settings.MODEL_LOAD_TIMEOUT)
@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError
+
+from cinematch.registry import ModelNotReady
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-item predictions into one batched call.
+
+    Callers submit one item and block on its result. A worker thread
+    collects items until it has max_batch_size of them or max_wait_ms
+    passed since the first one, runs predict_batch once on the whole
+    batch and hands every caller its own result.
+
+    By default every item counts as 1 towards max_batch_size. Pass
+    item_size when an item stands for several inputs (e.g. a list of
+    texts), so the batch is capped on the inputs instead; an item larger
+    than max_batch_size still runs, alone.
+
+    A caller that gets no result within its timeout gets ModelNotReady,
+    and a batch whose predict_batch fails or returns the wrong number of
+    results fails every caller in it, so nobody waits forever.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=16, max_wait_ms=5,
+                 item_size=None):
+        self._predict_batch = predict_batch
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait = max_wait_ms / 1000
+        self._item_size = item_size or (lambda item: 1)
+        self._pending = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._items = 0
+        self._batches = 0
+        self._predict_seconds = 0.0
+
+    def submit(self, item, timeout=None):
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            raise ModelNotReady(
+                f"no prediction within {timeout}s"
+            ) from None
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="sentiment-batcher",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _collect(self):
+        if self._pending is not None:
+            batch, self._pending = [self._pending], None
+        else:
+            batch = [self._queue.get()]
+        size = self._item_size(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            entry_size = self._item_size(entry[0])
+            if size + entry_size > self.max_batch_size:
+                # Tidak muat, jadi awal batch berikutnya
+                self._pending = entry
+                break
+            batch.append(entry)
+            size += entry_size
+        return batch
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch = self._collect()
+                items = [item for item, _ in batch]
+                started = time.perf_counter()
+                results = self._predict_batch(items)
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"predict_batch returned {len(results)} results "
+                        f"for {len(batch)} items"
+                    )
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+                self._record(sum(self._item_size(item) for item in items),
+                             time.perf_counter() - started)
+            except Exception as error:
+                # Worker tetap hidup, hanya batch ini yang gagal
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+
+    def _record(self, size, seconds):
+        with self._metrics_lock:
+            self._batch_sizes[size] += 1
+            self._items += size
+            self._batches += 1
+            self._predict_seconds += seconds
+
+    def metrics(self):
+        with self._metrics_lock:
+            batches = self._batches
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": batches,
+                "items": self._items,
+                "mean_batch_size": self._items / batches if batches else 0.0,
+                "mean_fill": (self._items / (batches * self.max_batch_size)
+                              if batches else 0.0),
+                "mean_predict_ms": (self._predict_seconds * 1000 / batches
+                                    if batches else 0.0),
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+                "queued": self._queue.qsize(),
+            }
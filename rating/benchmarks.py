@@ -0,0 +1,113 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from recommendations.benchmarks import percentiles, throughput, time_calls
+from .cache import SentimentCache
+from .model import predict_texts
+from .models import SentimentScore
+
+VOCABULARY = (
+    "the movie film plot acting was great boring slow story ending "
+    "characters soundtrack loved hated scenes funny sad director cast "
+    "visuals pacing script really not very quite too good bad"
+).split()
+
+
+def synthetic_reviews(count, words, rng):
+    return [
+        " ".join(rng.choice(VOCABULARY, words))
+        for _ in range(count)
+    ]
+
+
+def benchmark_sentiment(model, batch_sizes=(1, 8, 32), text_lengths=(5, 20, 50),
+                        repeats=20, seed=0):
+    """
+    Latency of one forward pass of the sentiment model for every
+    combination of batch size and review length (in words), on synthetic
+    reviews.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for batch_size in batch_sizes:
+        for words in text_lengths:
+            batches = [
+                synthetic_reviews(batch_size, words, rng)
+                for _ in range(repeats)
+            ]
+
+            def predict(texts):
+                return predict_texts(model, texts)
+
+            # Panggilan pertama untuk shape ini ikut tracing, tidak dihitung
+            started = time.perf_counter()
+            predict(batches[0])
+            first_call = time.perf_counter() - started
+
+            samples = time_calls(predict, batches)
+            results.append({
+                "batch_size": batch_size,
+                "words": words,
+                "first_call_ms": first_call * 1000,
+                **percentiles(samples),
+                "reviews_per_second": throughput(samples, batch_size),
+            })
+    return results
+
+
+def _timed(function, argument):
+    started = time.perf_counter()
+    function(argument)
+    return time.perf_counter() - started
+
+
+def benchmark_sentiment_service(concurrency=(1, 8, 32), requests=64,
+                                words=20, seed=0):
+    """
+    Latency of get_sentiment_score, the path a review goes through: the
+    sentiment cache, then the micro-batcher and the registry model (or the
+    sentiment server). Every concurrency level sends requests new reviews
+    from that many threads, so they miss the cache and get batched, then
+    sends the same reviews again, which are served from the cache.
+
+    Scores go through a private SentimentCache whose keys use a version of
+    their own, so real scores are never read, overwritten or removed. Only
+    the rows written by this run are deleted afterwards.
+    """
+    from .service import SENTIMENT_BATCHER, get_sentiment_score
+
+    version = f"benchmark-{uuid.uuid4().hex}"
+    cache = SentimentCache(maxsize=requests, version=version)
+
+    def score(text):
+        return get_sentiment_score(text, cache=cache)
+
+    rng = np.random.default_rng(seed)
+    results = []
+    try:
+        for threads in concurrency:
+            texts = synthetic_reviews(requests, words, rng)
+            cache.clear()
+
+            result = {"concurrency": threads, "words": words}
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for phase in ("miss", "hit"):
+                    batches_before = SENTIMENT_BATCHER.metrics()["batches"]
+                    started = time.perf_counter()
+                    samples = list(pool.map(
+                        lambda text: _timed(score, text), texts
+                    ))
+                    elapsed = time.perf_counter() - started
+                    result[phase] = {
+                        **percentiles(samples),
+                        "reviews_per_second": requests / elapsed,
+                        "batches": (SENTIMENT_BATCHER.metrics()["batches"]
+                                    - batches_before),
+                    }
+            results.append(result)
+    finally:
+        SentimentScore.objects.filter(model_version=version).delete()
+    return results
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from functools import lru_cache
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.db import DatabaseError
+
+from .model import sentiment_model_version
+from .models import SentimentScore
+
+
+def normalize_text(description):
+    # Model hanya melihat teks lowercase, dan tokenizer BERT mengabaikan
+    # spasi berlebih, jadi keduanya aman dinormalisasi untuk key cache
+    return " ".join(description.lower().split())
+
+
+@lru_cache(maxsize=1)
+def model_version():
+    return sentiment_model_version()
+
+
+class SentimentCache:
+    """
+    Content-addressed cache of sentiment scores.
+
+    Scores are keyed on a hash of the normalized text and the model
+    version, so a new model never reads an old score. Lookups go to an
+    in-process LRU first, then to the SentimentScore table, which is
+    shared by every process and survives restarts.
+
+    version overrides the model version in the keys, so a cache with its
+    own version never shares entries with the real one.
+    """
+
+    def __init__(self, maxsize, version=None):
+        self.version = version
+        self._scores = LRUCache(maxsize=max(int(maxsize), 1))
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._db_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(description, version):
+        text = normalize_text(description)
+        return hashlib.sha256(f"{version}:{text}".encode()).hexdigest()
+
+    def get_many(self, descriptions):
+        """
+        Return {description: score} for every description already cached.
+        """
+        version = self.version or model_version()
+        keys = {description: self.key(description, version)
+                for description in descriptions}
+        found = {}
+        with self._lock:
+            for description, key in keys.items():
+                if key in self._scores:
+                    found[description] = self._scores[key]
+            self._memory_hits += len(found)
+
+        missing = {key: description for description, key in keys.items()
+                   if description not in found}
+        stored = {}
+        if missing:
+            try:
+                stored = dict(SentimentScore.objects.filter(
+                        key__in=list(missing)
+                ).values_list('key', 'score'))
+            except DatabaseError as error:
+                print(f"[SENTIMENT CACHE] lookup failed: {error!r}")
+
+        with self._lock:
+            for key, score in stored.items():
+                self._scores[key] = score
+                found[missing[key]] = score
+            self._db_hits += len(stored)
+            self._misses += len(missing) - len(stored)
+        return found
+
+    def get(self, description):
+        return self.get_many([description]).get(description)
+
+    def set_many(self, scores):
+        """
+        Store {description: score} in memory and in the table.
+        """
+        version = self.version or model_version()
+        entries = {self.key(description, version): score
+                   for description, score in scores.items()}
+        with self._lock:
+            self._scores.update(entries)
+        try:
+            SentimentScore.objects.bulk_create([
+                SentimentScore(key=key, score=score, model_version=version)
+                for key, score in entries.items()
+            ], ignore_conflicts=True)
+        except DatabaseError as error:
+            print(f"[SENTIMENT CACHE] store failed: {error!r}")
+
+    def set(self, description, score):
+        self.set_many({description: score})
+
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+
+    def metrics(self):
+        with self._lock:
+            hits = self._memory_hits + self._db_hits
+            lookups = hits + self._misses
+            return {
+                "size": len(self._scores),
+                "maxsize": self._scores.maxsize,
+                "memory_hits": self._memory_hits,
+                "db_hits": self._db_hits,
+                "misses": self._misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+SENTIMENT_CACHE = SentimentCache(maxsize=settings.SENTIMENT_CACHE_SIZE)
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from movie.models import Movie, Review
+from rating.cache import model_version
+from rating.service import score_descriptions
+
+CHECKPOINT_FILE = 'rating/rescore_reviews.checkpoint'
+
+
+def default_batch_size():
+    return min(16 * (os.cpu_count() or 1), 256)
+
+
+def read_checkpoint(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def write_checkpoint(path, checkpoint):
+    with open(f"{path}.tmp", 'w') as file:
+        json.dump(checkpoint, file)
+    os.replace(f"{path}.tmp", path)
+
+
+def recompute_movie_ratings():
+    """
+    Recompute rating and review_count of every movie from its scored
+    reviews in a single UPDATE.
+    """
+    scored = Review.objects.filter(
+            movie=OuterRef('pk'),
+            scoring_status=Review.SCORED,
+    ).order_by().values('movie')
+    return Movie.objects.update(
+        rating=Coalesce(
+            Subquery(scored.annotate(value=Avg('rating')).values('value'),
+                     output_field=FloatField()),
+            0.0,
+        ),
+        review_count=Coalesce(
+            Subquery(scored.annotate(value=Count('pk')).values('value'),
+                     output_field=IntegerField()),
+            0,
+        ),
+    )
+
+
+class Command(BaseCommand):
+    help = ("Re-score every review with the current sentiment model, then "
+            "recompute the movie ratings. Resumes from the last checkpoint "
+            "if a previous run was interrupted")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help="Reviews read from and written to the database per chunk",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=default_batch_size(),
+            help="Reviews per forward pass (default scales with CPU count)",
+        )
+        parser.add_argument('--checkpoint', default=CHECKPOINT_FILE)
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Ignore the checkpoint and re-score from the beginning",
+        )
+
+    def handle(self, *args, **options):
+        version = model_version()
+        checkpoint = None
+        if not options['restart']:
+            checkpoint = read_checkpoint(options['checkpoint'])
+        if checkpoint is not None and checkpoint['model_version'] != version:
+            # Checkpoint dari model lain, mulai dari awal
+            checkpoint = None
+        if checkpoint is None:
+            checkpoint = {"model_version": version, "last_pk": None, "done": 0}
+        else:
+            self.stdout.write(
+                f"Resuming after {checkpoint['done']} reviews"
+            )
+
+        reviews = Review.objects.order_by('pk').only('pk', 'description')
+        if checkpoint['last_pk'] is not None:
+            reviews = reviews.filter(pk__gt=checkpoint['last_pk'])
+
+        total = checkpoint['done'] + reviews.count()
+        started = time.perf_counter()
+        scored = 0
+        chunk = []
+        for review in reviews.iterator(chunk_size=options['chunk_size']):
+            chunk.append(review)
+            if len(chunk) == options['chunk_size']:
+                self._rescore(chunk, options['batch_size'])
+                scored += len(chunk)
+                self._save_progress(options, checkpoint, chunk, total,
+                                    scored, started)
+                chunk = []
+        if chunk:
+            self._rescore(chunk, options['batch_size'])
+            scored += len(chunk)
+            self._save_progress(options, checkpoint, chunk, total,
+                                scored, started)
+
+        movies = recompute_movie_ratings()
+        if os.path.isfile(options['checkpoint']):
+            os.remove(options['checkpoint'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-scored {scored} reviews and {movies} movies in "
+            f"{elapsed:.1f}s ({scored / elapsed if elapsed else 0:.1f} "
+            f"reviews/s)"
+        ))
+
+    @staticmethod
+    def _rescore(chunk, batch_size):
+        for start in range(0, len(chunk), batch_size):
+            batch = chunk[start:start + batch_size]
+            scores = score_descriptions(
+                [review.description for review in batch]
+            )
+            for review, score in zip(batch, scores):
+                review.rating = score
+                review.sentiment = Review.sentiment_for(score)
+                review.scoring_status = Review.SCORED
+        Review.objects.bulk_update(
+            chunk, ['rating', 'sentiment', 'scoring_status']
+        )
+
+    def _save_progress(self, options, checkpoint, chunk, total, scored,
+                       started):
+        checkpoint['last_pk'] = str(chunk[-1].pk)
+        checkpoint['done'] += len(chunk)
+        write_checkpoint(options['checkpoint'], checkpoint)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{checkpoint['done']}/{total} reviews "
+            f"({scored / elapsed if elapsed else 0:.1f} reviews/s)"
+        )
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rating.model import (
+        SENTIMENT_MODEL_PATH,
+        load_sentiment_model,
+        warm_up_sentiment_model,
+)
+from rating.server import SentimentServer
+
+
+class Command(BaseCommand):
+    help = ("Load the sentiment model once and serve it to every web "
+            "worker over a Unix socket")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            default=settings.SENTIMENT_SERVER_SOCKET,
+            help="Defaults to SENTIMENT_SERVER_SOCKET",
+        )
+        parser.add_argument('--path', default=SENTIMENT_MODEL_PATH)
+        parser.add_argument(
+            '--max-batch-size',
+            type=int,
+            default=settings.SENTIMENT_MAX_BATCH_SIZE,
+            help="Client requests merged into one forward pass",
+        )
+        parser.add_argument(
+            '--max-wait-ms',
+            type=float,
+            default=settings.SENTIMENT_MAX_WAIT_MS,
+        )
+
+    def handle(self, *args, **options):
+        if not options['socket']:
+            raise CommandError(
+                "Pass --socket or set SENTIMENT_SERVER_SOCKET"
+            )
+
+        # Socket baru dibuka setelah model siap, jadi client yang bisa
+        # connect pasti langsung dilayani
+        model = load_sentiment_model(options['path'])
+        if settings.MODEL_WARMUP:
+            warm_up_sentiment_model(model, settings.MODEL_WARMUP_BATCH_SIZES)
+        server = SentimentServer(
+            options['socket'],
+            model,
+            max_batch_size=options['max_batch_size'],
+            max_wait_ms=options['max_wait_ms'],
+            timeout=settings.SENTIMENT_SERVER_TIMEOUT,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Sentiment server listening on {options['socket']}"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
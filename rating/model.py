@@ -0,0 +1,59 @@
+import hashlib
+import os
+
+SENTIMENT_MODEL_PATH = 'rating/sentiment_model'
+
+
+def load_sentiment_model(path=SENTIMENT_MODEL_PATH):
+    import tensorflow as tf
+    import tensorflow_text as text  # noqa: F401, registers the BERT ops
+
+    load_options = tf.saved_model.LoadOptions(
+        experimental_io_device='/job:localhost'
+    )
+    return tf.saved_model.load(path, options=load_options)
+
+
+def sentiment_model_version(path=SENTIMENT_MODEL_PATH):
+    """
+    Short fingerprint of the SavedModel files, changes whenever the model
+    is replaced. Used to key cached scores.
+    """
+    digest = hashlib.sha1()
+    for root, _, filenames in sorted(os.walk(path)):
+        for filename in sorted(filenames):
+            filepath = os.path.join(root, filename)
+            stat = os.stat(filepath)
+            name = os.path.relpath(filepath, path)
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def predict_texts(model, texts):
+    """
+    Sentiment scores in [0, 1] for already lowercased texts, one forward
+    pass for the whole list.
+    """
+    import tensorflow as tf
+
+    results = model(tf.convert_to_tensor(texts, dtype=tf.string))
+    return tf.sigmoid(results).numpy().ravel().tolist()
+
+
+WARMUP_TEXTS = [
+    "great movie",
+    "the plot was slow in the middle but the acting and the soundtrack "
+    "made up for it, would watch again with friends",
+    " ".join(["a long review that fills the whole description field"] * 5),
+]
+
+
+def warm_up_sentiment_model(model, batch_sizes):
+    """
+    Run dummy reviews of a few lengths through the model at each batch
+    size, so TensorFlow traces and optimizes those shapes before the
+    first real review.
+    """
+    for batch_size in batch_sizes:
+        texts = [WARMUP_TEXTS[i % len(WARMUP_TEXTS)] for i in range(batch_size)]
+        predict_texts(model, texts)
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class SentimentScore(models.Model):
+    """
+    Persistent sentiment score cache, keyed on a hash of the normalized
+    review text and the model version that scored it.
+    """
+    key = models.CharField(max_length=64, primary_key=True)
+    score = models.FloatField()
+    model_version = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.key} ({self.score:.3f})"
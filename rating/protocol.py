@@ -0,0 +1,87 @@
+"""
+Wire format of the sentiment server.
+
+Every message is a frame: a 4-byte big-endian length, then the payload.
+A request payload is the number of texts followed by each text as a
+length-prefixed UTF-8 string. A reply payload starts with a status byte:
+OK is followed by the number of scores and the scores as float32, ERROR by
+a UTF-8 error message.
+"""
+import struct
+
+LENGTH = struct.Struct(">I")
+
+OK = b"\x00"
+ERROR = b"\x01"
+
+
+def recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock, payload):
+    sock.sendall(LENGTH.pack(len(payload)) + payload)
+
+
+def recv_frame(sock):
+    """
+    Read one frame, returns None if the peer closed the connection.
+    """
+    header = recv_exact(sock, LENGTH.size)
+    if header is None:
+        return None
+    (size,) = LENGTH.unpack(header)
+    if size == 0:
+        return b""
+    payload = recv_exact(sock, size)
+    if payload is None:
+        raise ConnectionError("connection closed mid-frame")
+    return payload
+
+
+def encode_texts(texts):
+    parts = [LENGTH.pack(len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_texts(payload):
+    (count,) = LENGTH.unpack_from(payload)
+    offset = LENGTH.size
+    texts = []
+    for _ in range(count):
+        (size,) = LENGTH.unpack_from(payload, offset)
+        offset += LENGTH.size
+        texts.append(payload[offset:offset + size].decode("utf-8"))
+        offset += size
+    return texts
+
+
+def encode_scores(scores):
+    return OK + LENGTH.pack(len(scores)) + struct.pack(f">{len(scores)}f",
+                                                        *scores)
+
+
+def encode_error(message):
+    return ERROR + message.encode("utf-8")
+
+
+def decode_reply(payload):
+    """
+    Scores of an OK reply, raises RuntimeError with the server's message
+    for an ERROR reply.
+    """
+    if payload[:1] == ERROR:
+        raise RuntimeError(payload[1:].decode("utf-8"))
+    (count,) = LENGTH.unpack_from(payload, 1)
+    return list(struct.unpack_from(f">{count}f", payload, 1 + LENGTH.size))
@@ -0,0 +1,165 @@
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from cinematch.registry import ModelNotReady
+from .batching import MicroBatcher
+from .model import predict_texts
+from .protocol import (
+        decode_reply,
+        decode_texts,
+        encode_error,
+        encode_scores,
+        encode_texts,
+        recv_frame,
+        send_frame,
+)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        # Satu koneksi dipakai terus oleh satu thread web worker
+        while True:
+            payload = recv_frame(self.request)
+            if payload is None:
+                return
+            texts = decode_texts(payload)
+            try:
+                reply = encode_scores(self.server.predict(texts))
+            except Exception as error:
+                reply = encode_error(repr(error))
+            send_frame(self.request, reply)
+
+
+class SentimentServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+    """
+    Serves the sentiment model to every web worker over a Unix socket.
+
+    The model lives only in this process, so web workers can be scaled
+    without copying it. Requests arriving together from different workers
+    are merged into one forward pass of at most max_batch_size texts.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, model, max_batch_size=16, max_wait_ms=5,
+                 timeout=None):
+        self.model = model
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.timeout = timeout
+        self.batcher = MicroBatcher(
+            self._predict_requests,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=max_wait_ms,
+            item_size=len,
+        )
+        if os.path.exists(socket_path):
+            # Socket sisa proses sebelumnya
+            os.remove(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+    def predict(self, texts):
+        # Request yang lebih besar dari max_batch_size dipecah dulu
+        scores = []
+        for start in range(0, len(texts), self.max_batch_size):
+            scores.extend(self.batcher.submit(
+                texts[start:start + self.max_batch_size],
+                timeout=self.timeout,
+            ))
+        return scores
+
+    def _predict_requests(self, requests):
+        scores = predict_texts(
+            self.model, [text for texts in requests for text in texts]
+        )
+        results = []
+        offset = 0
+        for texts in requests:
+            results.append(scores[offset:offset + len(texts)])
+            offset += len(texts)
+        return results
+
+
+class SentimentClient:
+    """
+    Client of SentimentServer, keeps one connection per thread open.
+    Connection failures and timeouts are raised as ModelNotReady, like a
+    model that is still loading.
+    """
+
+    def __init__(self, socket_path, timeout=30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+
+    def _request(self, sock, texts):
+        send_frame(sock, encode_texts(texts))
+        payload = recv_frame(sock)
+        if payload is None:
+            raise ConnectionError("sentiment server closed the connection")
+        return decode_reply(payload)
+
+    def predict(self, texts):
+        sock = getattr(self._local, "sock", None)
+        reused = sock is not None
+        try:
+            if sock is None:
+                sock = self._local.sock = self._connect()
+            return self._request(sock, texts)
+        except TimeoutError as error:
+            # Server mungkin masih mengerjakan request ini, jangan dikirim
+            # ulang supaya tidak dihitung dua kali
+            self._close()
+            raise ModelNotReady("sentiment server timed out") from error
+        except OSError as error:
+            self._close()
+            if not reused:
+                raise ModelNotReady(
+                    "sentiment server is unreachable"
+                ) from error
+
+        # Koneksi lama bisa putus kalau server restart, coba sekali lagi
+        # dengan koneksi baru
+        try:
+            sock = self._local.sock = self._connect()
+            return self._request(sock, texts)
+        except OSError as error:
+            self._close()
+            raise ModelNotReady("sentiment server is unreachable") from error
+
+    def ping(self):
+        self.predict([])
+
+
+def connect_sentiment_server(socket_path, timeout=30, wait=120):
+    """
+    Loader used by web processes when SENTIMENT_SERVER_SOCKET is set:
+    waits up to wait seconds for the server to come up. If it is still
+    not up, the load fails with ModelNotReady and the registry retries it
+    later.
+    """
+    client = SentimentClient(socket_path, timeout)
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            client.ping()
+            return client
+        except ModelNotReady:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(1)
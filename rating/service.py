@@ -1,15 +1,61 @@
-import tensorflow as tf
 from django.apps import apps
+from django.conf import settings
+
+from .batching import MicroBatcher
+from .cache import SENTIMENT_CACHE
+from .model import predict_texts
 
 CONFIG = apps.get_app_config('rating')
-MODEL = CONFIG.sentiment_model
 
 
-def predict_sentiment(description):
-    results = MODEL(description)
-    return tf.sigmoid(results).numpy().item()
+def predict_sentiment_batch(descriptions):
+    """
+    Skor sentimen untuk banyak review dengan satu forward pass, di proses
+    ini atau di sentiment server.
+    """
+    texts = [description.lower() for description in descriptions]
+    model = CONFIG.get_model()
+    if settings.SENTIMENT_SERVER_SOCKET:
+        return model.predict(texts)
+    return predict_texts(model, texts)
+
+
+SENTIMENT_BATCHER = MicroBatcher(
+    predict_sentiment_batch,
+    max_batch_size=settings.SENTIMENT_MAX_BATCH_SIZE,
+    max_wait_ms=settings.SENTIMENT_MAX_WAIT_MS,
+)
+
+
+def score_descriptions(descriptions):
+    """
+    Like predict_sentiment_batch, but only runs the model on texts that
+    are not in the sentiment cache yet.
+    """
+    scores = SENTIMENT_CACHE.get_many(descriptions)
+    missing = list(dict.fromkeys(
+        description for description in descriptions
+        if description not in scores
+    ))
+    if missing:
+        predicted = dict(zip(missing, predict_sentiment_batch(missing)))
+        SENTIMENT_CACHE.set_many(predicted)
+        scores.update(predicted)
+    return [scores[description] for description in descriptions]
+
 
+def get_sentiment_score(description, cache=SENTIMENT_CACHE):
+    score = cache.get(description)
+    if score is not None:
+        return score
 
-def get_sentiment_score(description):
-    desc = tf.convert_to_tensor([description.lower()], dtype=tf.string)
-    return predict_sentiment(desc)
+    if settings.SENTIMENT_MAX_BATCH_SIZE > 1:
+        # Review yang masuk bersamaan digabung jadi satu batch
+        score = SENTIMENT_BATCHER.submit(
+            description,
+            timeout=settings.MODEL_LOAD_TIMEOUT,
+        )
+    else:
+        score = predict_sentiment_batch([description])[0]
+    cache.set(description, score)
+    return score
@@ -0,0 +1,68 @@
+import socket
+import struct
+
+from django.test import SimpleTestCase
+
+from .protocol import (
+        LENGTH,
+        decode_reply,
+        decode_texts,
+        encode_error,
+        encode_scores,
+        encode_texts,
+        recv_frame,
+        send_frame,
+)
+
+
+class ProtocolTests(SimpleTestCase):
+
+    def setUp(self):
+        self.left, self.right = socket.socketpair()
+        self.addCleanup(self.left.close)
+        self.addCleanup(self.right.close)
+
+    def test_texts_round_trip(self):
+        texts = ["great movie", "", "film yang bagus 🎬", "x" * 70000]
+        self.assertEqual(decode_texts(encode_texts(texts)), texts)
+
+    def test_no_texts(self):
+        self.assertEqual(decode_texts(encode_texts([])), [])
+
+    def test_scores_round_trip(self):
+        scores = decode_reply(encode_scores([0.25, 1.0, 0.0]))
+        self.assertEqual(scores, [0.25, 1.0, 0.0])
+
+    def test_scores_are_float32(self):
+        scores = decode_reply(encode_scores([0.1]))
+        self.assertEqual(scores, list(struct.unpack(">f",
+                                                    struct.pack(">f", 0.1))))
+
+    def test_error_reply_raises(self):
+        with self.assertRaisesMessage(RuntimeError, "model exploded"):
+            decode_reply(encode_error("model exploded"))
+
+    def test_frames_over_socket(self):
+        payloads = [encode_texts(["a", "b"]), b"", encode_scores([0.5])]
+        for payload in payloads:
+            send_frame(self.left, payload)
+        for payload in payloads:
+            self.assertEqual(recv_frame(self.right), payload)
+
+    def test_frame_split_across_sends(self):
+        payload = encode_texts(["split review"])
+        data = LENGTH.pack(len(payload)) + payload
+        self.left.sendall(data[:3])
+        self.left.sendall(data[3:10])
+        self.left.sendall(data[10:])
+        self.assertEqual(recv_frame(self.right), payload)
+
+    def test_closed_connection_returns_none(self):
+        self.left.close()
+        self.assertIsNone(recv_frame(self.right))
+
+    def test_closed_mid_frame_raises(self):
+        self.left.sendall(LENGTH.pack(10) + b"abc")
+        self.left.close()
+        with self.assertRaises(ConnectionError):
+            recv_frame(self.right)
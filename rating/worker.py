@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from cinematch.registry import ModelNotReady
+from movie.models import Movie, Review
+from .service import score_descriptions
+
+
+class ReviewScoringWorker:
+    """
+    Scores PENDING reviews in the background.
+
+    A dispatcher thread picks up pending reviews whenever it is notified
+    of a new one (or every poll_seconds, which also catches reviews left
+    pending by a restart) and hands them to a thread pool in batches.
+    Each batch is one forward pass, after which the reviews and the
+    movie ratings are updated.
+    """
+
+    def __init__(self, threads=2, batch_size=32, poll_seconds=5.0):
+        self.threads = threads
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.threads,
+                thread_name_prefix="review-scoring",
+            )
+            self._thread = threading.Thread(
+                target=self._dispatch,
+                name="review-scoring-dispatcher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def notify(self):
+        self.start()
+        self._wake.set()
+
+    def _dispatch(self):
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            try:
+                self._submit_pending()
+            except Exception as error:
+                print(f"[REVIEW SCORING] dispatch failed: {error!r}")
+            finally:
+                close_old_connections()
+
+    def _submit_pending(self):
+        with self._lock:
+            in_flight = set(self._in_flight)
+        pending = list(Review.objects.filter(
+                scoring_status=Review.PENDING
+        ).exclude(pk__in=in_flight).order_by('created_at').values_list(
+                'pk', 'description'
+        )[:self.batch_size * self.threads])
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            with self._lock:
+                self._in_flight.update(pk for pk, _ in batch)
+            self._executor.submit(self._score, batch)
+
+    def _score(self, batch):
+        try:
+            scores = score_descriptions(
+                [description for _, description in batch]
+            )
+            for (pk, _), score in zip(batch, scores):
+                self._save(pk, score)
+        except ModelNotReady:
+            # Tetap PENDING, dicoba lagi di putaran berikutnya
+            pass
+        except Exception as error:
+            print(f"[REVIEW SCORING] batch failed: {error!r}")
+            Review.objects.filter(
+                    pk__in=[pk for pk, _ in batch],
+                    scoring_status=Review.PENDING,
+            ).update(scoring_status=Review.FAILED)
+        finally:
+            with self._lock:
+                self._in_flight.difference_update(pk for pk, _ in batch)
+            close_old_connections()
+
+    @staticmethod
+    def _save(pk, score):
+        # Hanya review yang masih PENDING yang diupdate, jadi skor dan
+        # rating film tidak pernah dihitung dua kali
+        updated = Review.objects.filter(
+                pk=pk,
+                scoring_status=Review.PENDING,
+        ).update(
+                rating=score,
+                sentiment=Review.sentiment_for(score),
+                scoring_status=Review.SCORED,
+        )
+        if updated:
+            movie_id = Review.objects.filter(pk=pk).values_list(
+                    'movie_id', flat=True
+            ).first()
+            Movie(pk=movie_id).add_review_rating(score)
+
+
+REVIEW_SCORING_WORKER = ReviewScoringWorker(
+    threads=settings.SENTIMENT_WORKER_THREADS,
+    batch_size=settings.SENTIMENT_WORKER_BATCH_SIZE,
+    poll_seconds=settings.SENTIMENT_WORKER_POLL_SECONDS,
+)
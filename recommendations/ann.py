@@ -0,0 +1,146 @@
+import os
+
+import numpy as np
+
+from .ranking import exclude, top_k
+from .scoring import score, to_dense
+from .store import MODEL_PATH, load_store, store_version
+
+IVF_FILE = 'ivf.npz'
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbor index.
+
+    The catalog is clustered around nlist centroids, and the rows of
+    cluster c are rows[offsets[c]:offsets[c + 1]]. A search only scores
+    the rows of the nprobe clusters closest to the query, so raising
+    nprobe trades latency for recall. If the probed clusters hold fewer
+    than k candidates, the whole catalog is scored instead.
+    """
+
+    def __init__(self, centroids, offsets, rows):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+
+    @property
+    def nlist(self):
+        return self.centroids.shape[0]
+
+    def candidates(self, query, nprobe):
+        # nprobe dari environment, minimal satu cluster
+        nprobe = max(1, min(int(nprobe), self.nlist))
+        probes, _ = top_k(self.centroids @ to_dense(query).ravel(), nprobe)
+        candidates = np.concatenate([
+            self.rows[self.offsets[c]:self.offsets[c + 1]] for c in probes
+        ])
+        # Baris diurutkan supaya akses ke feature matrix (mmap) berurutan
+        return np.sort(candidates)
+
+    def search(self, features, query, k, nprobe, excluded_indices=()):
+        candidates = self.candidates(query, nprobe)
+        if len(excluded_indices):
+            candidates = candidates[
+                ~np.isin(candidates, excluded_indices)
+            ]
+        if len(candidates) < k:
+            similarity = score(features, query)
+            exclude(similarity, excluded_indices)
+            return top_k(similarity, k)
+        order, scores = top_k(score(features[candidates], query), k)
+        return candidates[order], scores
+
+
+def _assign(features, centroids, block_size=8192):
+    labels = np.empty(features.shape[0], dtype=np.int32)
+    for start in range(0, features.shape[0], block_size):
+        block = features[start:start + block_size]
+        labels[start:start + block_size] = np.argmax(
+            to_dense(block @ centroids.T), axis=1
+        )
+    return labels
+
+
+def train_ivf(features, nlist, iterations=10, sample_size=100000, seed=0):
+    """
+    Spherical k-means over the L2-normalized rows of features.
+    Centroids are trained on a random sample, then every row is assigned
+    to its closest centroid.
+    """
+    rng = np.random.default_rng(seed)
+    n = features.shape[0]
+    nlist = max(min(int(nlist), n), 1)
+
+    sample_rows = np.sort(rng.choice(n, min(sample_size, n), replace=False))
+    sample = to_dense(features[sample_rows]).astype(np.float32)
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        for c in range(nlist):
+            members = sample[labels == c]
+            if len(members) == 0:
+                # Cluster kosong diisi ulang dengan baris acak
+                centroids[c] = sample[rng.integers(len(sample))]
+                continue
+            centroid = members.sum(axis=0)
+            norm = np.linalg.norm(centroid)
+            centroids[c] = centroid / norm if norm > 0 else centroid
+
+    labels = _assign(features, centroids)
+    rows = np.argsort(labels, kind='stable').astype(np.int32)
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+    return IVFIndex(centroids, offsets, rows)
+
+
+def save_ivf(path, index):
+    """
+    Save the index next to the feature store it was trained on, tagged
+    with that store's version so load_ivf can spot a stale index.
+    """
+    filepath = os.path.join(path, IVF_FILE)
+    with open(f"{filepath}.tmp", 'wb') as file:
+        np.savez(
+            file,
+            centroids=index.centroids,
+            offsets=index.offsets,
+            rows=index.rows,
+            store_version=np.array(store_version(path)),
+        )
+    os.replace(f"{filepath}.tmp", filepath)
+
+
+def load_ivf(path=MODEL_PATH, n_rows=None):
+    """
+    Load the index in path, or None if there is none or it was built for
+    another version of the feature store (rebuild it with
+    `manage.py build_ann_index`).
+    """
+    filepath = os.path.join(path, IVF_FILE)
+    if not os.path.isfile(filepath):
+        return None
+    with np.load(filepath) as data:
+        built_for = (str(data['store_version'])
+                     if 'store_version' in data.files else None)
+        if built_for != store_version(path):
+            print(f"--{IVF_FILE} was built for another feature store")
+            return None
+        if n_rows is not None and len(data['rows']) != n_rows:
+            print(f"--{IVF_FILE} has {len(data['rows'])} rows, "
+                  f"catalog has {n_rows}")
+            return None
+        return IVFIndex(data['centroids'], data['offsets'], data['rows'])
+
+
+def build_ivf_file(path=MODEL_PATH, nlist=None, iterations=10,
+                   sample_size=100000):
+    _, features, _ = load_store(path)
+    if nlist is None:
+        nlist = int(4 * np.sqrt(features.shape[0]))
+    index = train_ivf(features, nlist, iterations, sample_size)
+    save_ivf(path, index)
+    return index
@@ -1,5 +1,5 @@
-import os
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class RecommendationsConfig(AppConfig):
@@ -7,23 +7,30 @@ class RecommendationsConfig(AppConfig):
     name = "recommendations"
 
     def ready(self):
-        import pickle
+        from functools import partial
 
-        print('\n[RECOMMENDATIONS MODEL]')
-        path = 'recommendations/similarity_model'
+        from cinematch.registry import register
+        from .model import (
+                load_recommendation_model,
+                recommendation_model_changed,
+                warm_up_recommendation_model,
+        )
+        from . import signals  # noqa: F401
 
-        if os.path.isdir(f"{path}/"):
-            print("Directory FOUND!")
-        else:
-            print("Directory NOT FOUND!")
-        loaded_data = {}
-        for filename in os.listdir(f"{path}/"):
-            filepath = os.path.join(path, filename)
-            with open(filepath, 'rb') as file:
-                loaded_data[filename[:-4]] = pickle.load(file)
-            print(f"--{filename} loaded")
-        print()
+        # Model baru dimuat saat dibutuhkan (atau di background saat
+        # web server start), bukan setiap kali Django di-import
+        self.model = register(
+            "recommendations",
+            load_recommendation_model,
+            partial(
+                warm_up_recommendation_model,
+                batch_sizes=settings.MODEL_WARMUP_BATCH_SIZES,
+            ),
+            # Worker lain yang tidak menerima POST reload juga pindah ke
+            # versi CURRENT yang baru
+            changed=recommendation_model_changed,
+            check_seconds=settings.RECOMMENDATIONS_MODEL_CHECK_SECONDS,
+        )
 
-        self.movies = loaded_data["movies"]
-        self.features = loaded_data["features"]
-        self.similarity = loaded_data["similarity"]
+    def get_model(self):
+        return self.model.get(timeout=settings.MODEL_LOAD_TIMEOUT)
@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+from scipy import sparse
+
+from .ranking import exclude, top_k
+from .scoring import aggregate, score
+from .store import normalize_rows
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1000
+    return {
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+    }
+
+
+def time_calls(function, arguments):
+    samples = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def features_nbytes(features):
+    if sparse.issparse(features):
+        return (features.data.nbytes + features.indices.nbytes
+                + features.indptr.nbytes)
+    return features.nbytes
+
+
+def benchmark_sparse_vs_dense(movies=20000, features=5000, density=0.01,
+                              liked=20, number=10, repeats=50, seed=0):
+    """
+    Compare the dense and sparse scoring paths on the same synthetic
+    TF-IDF-like catalog: memory of the feature matrix and latency of one
+    recommendation (aggregate + score + top_k).
+    """
+    rng = np.random.default_rng(seed)
+    catalog = sparse.random(
+        movies, features, density=density, format='csr',
+        dtype=np.float32, random_state=seed,
+    )
+    sparse_features, norms = normalize_rows(catalog)
+    dense_features = sparse_features.toarray()
+    liked_rows = [
+        rng.choice(movies, liked, replace=False) for _ in range(repeats)
+    ]
+
+    results = {}
+    for name, matrix in (('dense', dense_features),
+                         ('sparse', sparse_features)):
+        def recommend(rows):
+            return top_k(score(matrix, aggregate(matrix, norms, rows)), number)
+
+        recommend(liked_rows[0])
+        results[name] = {
+            "features_mb": features_nbytes(matrix) / 2 ** 20,
+            **percentiles(time_calls(recommend, liked_rows)),
+        }
+    return results
+
+
+def throughput(samples, items_per_call=1):
+    total = float(np.sum(samples))
+    return len(samples) * items_per_call / total if total else 0.0
+
+
+def benchmark_recommendation_sizes(catalog_sizes=(10000, 100000),
+                                   liked_sizes=(1, 10, 100), features=300,
+                                   number=10, repeats=50, seed=0):
+    """
+    Latency of one recommendation (aggregate + score + exclude + top_k)
+    on synthetic dense L2-normalized catalogs, for every combination of
+    catalog size and liked-set size.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for movies in catalog_sizes:
+        catalog = rng.standard_normal((movies, features), dtype=np.float32)
+        matrix, norms = normalize_rows(catalog)
+        for liked in liked_sizes:
+            liked = min(liked, movies)
+            liked_rows = [
+                rng.choice(movies, liked, replace=False)
+                for _ in range(repeats)
+            ]
+
+            def recommend(rows):
+                similarity = score(matrix, aggregate(matrix, norms, rows))
+                exclude(similarity, rows)
+                return top_k(similarity, number)
+
+            recommend(liked_rows[0])
+            samples = time_calls(recommend, liked_rows)
+            results.append({
+                "catalog_size": movies,
+                "liked_size": liked,
+                "features": features,
+                "features_mb": features_nbytes(matrix) / 2 ** 20,
+                **percentiles(samples),
+                "per_second": throughput(samples),
+            })
+    return results
@@ -0,0 +1,53 @@
+import hashlib
+import threading
+
+from cachetools import LRUCache, TTLCache
+from django.conf import settings
+
+
+class RecommendationCache:
+    """
+    LRU cache with TTL for recommendation results.
+
+    Entries are keyed on a fingerprint of the liked movie ids and the model
+    version, so a changed liked set or a new model never reads a stale
+    entry. The last key of every user is remembered so their entry can be
+    evicted as soon as their playlists change.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._results = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._user_keys = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(movies_id, number, model_version):
+        fingerprint = ",".join(str(movie_id) for movie_id in sorted(movies_id))
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()
+        return f"{model_version}:{number}:{digest}"
+
+    def get(self, key):
+        with self._lock:
+            return self._results.get(key)
+
+    def set(self, user_id, key, value):
+        with self._lock:
+            self._results[key] = value
+            self._user_keys[user_id] = key
+
+    def invalidate(self, user_id):
+        with self._lock:
+            key = self._user_keys.pop(user_id, None)
+            if key is not None:
+                self._results.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._user_keys.clear()
+
+
+RECOMMENDATION_CACHE = RecommendationCache(
+    maxsize=settings.RECOMMENDATIONS_CACHE_SIZE,
+    ttl=settings.RECOMMENDATIONS_CACHE_TTL,
+)
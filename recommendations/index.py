@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+class MovieIndex:
+    """
+    Hash index from TMDB Movie_id to its row position in the feature matrix.
+    """
+
+    def __init__(self, movie_ids):
+        movie_ids = np.asarray(movie_ids)
+        positions = pd.Series(np.arange(len(movie_ids)), index=movie_ids)
+        # Kalau ada Movie_id duplikat, pakai baris pertama seperti sebelumnya
+        positions = positions[~positions.index.duplicated(keep='first')]
+
+        self._index = positions.index
+        self._rows = positions.to_numpy()
+        self.movie_ids = movie_ids
+
+    def __len__(self):
+        return len(self.movie_ids)
+
+    def __contains__(self, movie_id):
+        return movie_id in self._index
+
+    def get(self, movie_id, default=None):
+        position = self._index.get_indexer([movie_id])[0]
+        if position < 0:
+            return default
+        return int(self._rows[position])
+
+    def lookup(self, movie_ids):
+        """
+        Resolve many Movie_id at once, dropping ids that are not in the
+        catalog. Returns the row positions in the order they were given.
+        """
+        if len(movie_ids) == 0:
+            return np.empty(0, dtype=np.intp)
+        positions = self._index.get_indexer(np.asarray(movie_ids))
+        return self._rows[positions[positions >= 0]]
+
+    def ids(self, rows):
+        return self.movie_ids[rows]
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.store import (
+    MODEL_PATH,
+    activate_version,
+    current_version,
+    list_versions,
+)
+
+
+class Command(BaseCommand):
+    help = ("Make a versioned similarity model the CURRENT one. Every running "
+            "web process switches to it within "
+            "RECOMMENDATIONS_MODEL_CHECK_SECONDS, or right away for the one "
+            "serving POST /recommendations/reload/")
+
+    def add_arguments(self, parser):
+        parser.add_argument('version', nargs='?')
+
+    def handle(self, *args, **options):
+        version = options['version']
+        if version is None:
+            current = current_version()
+            for name in list_versions():
+                marker = '*' if name == current else ' '
+                self.stdout.write(f"{marker} {name}")
+            return
+
+        try:
+            activate_version(MODEL_PATH, version)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(f"{version} is now CURRENT"))
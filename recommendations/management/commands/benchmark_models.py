@@ -0,0 +1,130 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+
+from rating.benchmarks import benchmark_sentiment, benchmark_sentiment_service
+from rating.model import SENTIMENT_MODEL_PATH, load_sentiment_model
+from recommendations.benchmarks import benchmark_recommendation_sizes
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",")]
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the sentiment model and the recommendation scoring "
+            "on synthetic inputs (no network) and write the results as JSON")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help="JSON file to write, printed to stdout if omitted",
+        )
+        parser.add_argument('--skip-sentiment', action='store_true')
+        parser.add_argument('--skip-recommendations', action='store_true')
+        parser.add_argument(
+            '--skip-service',
+            action='store_true',
+            help="Skip get_sentiment_score (cache + batcher), which uses the "
+                 "configured sentiment model and the database",
+        )
+        parser.add_argument('--sentiment-path', default=SENTIMENT_MODEL_PATH)
+        parser.add_argument('--batch-sizes', type=int_list, default=[1, 8, 32])
+        parser.add_argument(
+            '--text-lengths',
+            type=int_list,
+            default=[5, 20, 50],
+            help="Review lengths in words",
+        )
+        parser.add_argument(
+            '--catalog-sizes',
+            type=int_list,
+            default=[10000, 100000],
+        )
+        parser.add_argument('--liked-sizes', type=int_list, default=[1, 10, 100])
+        parser.add_argument('--concurrency', type=int_list, default=[1, 8, 32])
+        parser.add_argument('--service-requests', type=int, default=64)
+        parser.add_argument('--features', type=int, default=300)
+        parser.add_argument('--repeats', type=int, default=20)
+
+    def handle(self, *args, **options):
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "machine": {
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "python": platform.python_version(),
+            },
+        }
+
+        if not options['skip_sentiment']:
+            started = time.perf_counter()
+            model = load_sentiment_model(options['sentiment_path'])
+            report["sentiment"] = {
+                "load_seconds": time.perf_counter() - started,
+                "results": benchmark_sentiment(
+                    model,
+                    batch_sizes=options['batch_sizes'],
+                    text_lengths=options['text_lengths'],
+                    repeats=options['repeats'],
+                ),
+            }
+            for result in report["sentiment"]["results"]:
+                self.stderr.write(
+                    f"sentiment batch {result['batch_size']:>4} "
+                    f"x {result['words']:>3} words: "
+                    f"p50 {result['p50_ms']:8.2f} ms  "
+                    f"p95 {result['p95_ms']:8.2f} ms  "
+                    f"{result['reviews_per_second']:8.1f} reviews/s"
+                )
+
+        if not options['skip_sentiment'] and not options['skip_service']:
+            report["sentiment_service"] = {
+                "results": benchmark_sentiment_service(
+                    concurrency=options['concurrency'],
+                    requests=options['service_requests'],
+                ),
+            }
+            for result in report["sentiment_service"]["results"]:
+                for phase in ("miss", "hit"):
+                    self.stderr.write(
+                        f"get_sentiment_score {result['concurrency']:>4} "
+                        f"threads, cache {phase}: "
+                        f"p50 {result[phase]['p50_ms']:8.2f} ms  "
+                        f"p95 {result[phase]['p95_ms']:8.2f} ms  "
+                        f"{result[phase]['reviews_per_second']:8.1f} reviews/s  "
+                        f"{result[phase]['batches']:>4} batches"
+                    )
+
+        if not options['skip_recommendations']:
+            report["recommendations"] = {
+                "results": benchmark_recommendation_sizes(
+                    catalog_sizes=options['catalog_sizes'],
+                    liked_sizes=options['liked_sizes'],
+                    features=options['features'],
+                    repeats=options['repeats'],
+                ),
+            }
+            for result in report["recommendations"]["results"]:
+                self.stderr.write(
+                    f"recommend {result['catalog_size']:>8} movies "
+                    f"x {result['liked_size']:>4} liked: "
+                    f"p50 {result['p50_ms']:8.2f} ms  "
+                    f"p95 {result['p95_ms']:8.2f} ms  "
+                    f"{result['per_second']:8.1f} /s"
+                )
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output)
+            self.stdout.write(self.style.SUCCESS(
+                f"Results written to {options['output']}"
+            ))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from recommendations.benchmarks import benchmark_sparse_vs_dense
+
+
+class Command(BaseCommand):
+    help = ("Compare memory and latency of the dense and sparse "
+            "recommendation scoring paths on a synthetic catalog")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=20000)
+        parser.add_argument('--features', type=int, default=5000)
+        parser.add_argument('--density', type=float, default=0.01)
+        parser.add_argument('--liked', type=int, default=20)
+        parser.add_argument('--repeats', type=int, default=50)
+
+    def handle(self, *args, **options):
+        results = benchmark_sparse_vs_dense(
+            movies=options['movies'],
+            features=options['features'],
+            density=options['density'],
+            liked=options['liked'],
+            repeats=options['repeats'],
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:>6}: {result['features_mb']:8.1f} MB  "
+                f"p50 {result['p50_ms']:7.2f} ms  "
+                f"p95 {result['p95_ms']:7.2f} ms"
+            )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.ann import IVF_FILE, build_ivf_file
+from recommendations.store import MODEL_PATH, has_store
+
+
+class Command(BaseCommand):
+    help = (f"Train the IVF approximate nearest-neighbor index ({IVF_FILE}) "
+            "used when RECOMMENDATIONS_SEARCH_BACKEND is 'ivf'")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=MODEL_PATH)
+        parser.add_argument(
+            '--nlist',
+            type=int,
+            default=None,
+            help="Number of clusters, defaults to 4 * sqrt(catalog size)",
+        )
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--sample-size', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not has_store(path):
+            raise CommandError(
+                f"No feature store in {path}, "
+                "run convert_similarity_model first"
+            )
+
+        index = build_ivf_file(
+            path,
+            options['nlist'],
+            options['iterations'],
+            options['sample_size'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {index.nlist} clusters over {len(index.rows)} movies "
+            f"to {path}/{IVF_FILE}"
+        ))
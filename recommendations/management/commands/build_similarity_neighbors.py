@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.neighbors import NEIGHBORS_FILE, build_neighbor_file
+from recommendations.store import MODEL_PATH, has_store
+
+
+class Command(BaseCommand):
+    help = f"Precompute the top-K similar movies table ({NEIGHBORS_FILE})"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=MODEL_PATH)
+        parser.add_argument('--k', type=int, default=50)
+        parser.add_argument('--block-size', type=int, default=1024)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not has_store(path):
+            raise CommandError(
+                f"No feature store in {path}, "
+                "run convert_similarity_model first"
+            )
+
+        table = build_neighbor_file(
+            path,
+            options['k'],
+            options['block_size'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(table.indptr) - 1} rows x {options['k']} neighbors "
+            f"to {path}/{NEIGHBORS_FILE}"
+        ))
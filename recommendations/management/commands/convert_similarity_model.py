@@ -0,0 +1,40 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recommendations.store import (
+    MODEL_PATH,
+    FEATURES_FILE,
+    MOVIES_FILE,
+    convert_pickles,
+)
+
+
+class Command(BaseCommand):
+    help = ("Convert movies.pkl and features.pkl into the memory-mapped "
+            f"{FEATURES_FILE} + {MOVIES_FILE} format")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=MODEL_PATH)
+        parser.add_argument(
+            '--version',
+            help=(f"Write into {MODEL_PATH}/<version>/ instead of --path, "
+                  "activate it with activate_similarity_model"),
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        for name in ('movies', 'features'):
+            filepath = os.path.join(path, f"{name}.pkl")
+            if not os.path.isfile(filepath):
+                raise CommandError(f"{filepath} not found")
+
+        output = path
+        if options['version']:
+            output = os.path.join(MODEL_PATH, options['version'])
+        count = convert_pickles(path, output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {count} movies to {output}/{FEATURES_FILE} "
+            f"and {output}/{MOVIES_FILE}"
+        ))
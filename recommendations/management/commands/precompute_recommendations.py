@@ -0,0 +1,80 @@
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from movie.models import Playlist, PlaylistMovie
+from recommendations.cache import RECOMMENDATION_CACHE
+from recommendations.models import UserRecommendation
+from recommendations.service import recommend_movies_batch
+
+
+class Command(BaseCommand):
+    help = ("Precompute home page recommendations for every user with "
+            "a playlist, scoring many users per matrix multiply")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=10)
+        parser.add_argument(
+            '--batch-users',
+            type=int,
+            default=1000,
+            help="Users loaded from the database and written per batch",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=256,
+            help="Users scored per matrix multiply",
+        )
+
+    def handle(self, *args, **options):
+        number = options['number']
+        model = apps.get_app_config('recommendations').get_model()
+        user_ids = list(Playlist.objects.order_by().values_list(
+                'user_id', flat=True
+        ).distinct())
+
+        started = time.perf_counter()
+        for start in range(0, len(user_ids), options['batch_users']):
+            batch = user_ids[start:start + options['batch_users']]
+
+            liked = defaultdict(list)
+            for user_id, tmdb_id in PlaylistMovie.objects.filter(
+                    playlist__user_id__in=batch
+            ).values_list('playlist__user_id', 'movie__tmdb_id'):
+                liked[user_id].append(tmdb_id)
+
+            batch = [user_id for user_id in batch if liked[user_id]]
+            results = recommend_movies_batch(
+                [liked[user_id] for user_id in batch],
+                number,
+                options['chunk_size'],
+            )
+
+            UserRecommendation.objects.bulk_create(
+                [
+                    UserRecommendation(
+                        user_id=user_id,
+                        movies_id=movies_id,
+                        fingerprint=RECOMMENDATION_CACHE.key(
+                            liked[user_id], number, model.version
+                        ),
+                    )
+                    for user_id, movies_id in zip(batch, results)
+                ],
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['movies_id', 'fingerprint', 'computed_at'],
+            )
+            self.stdout.write(
+                f"{min(start + options['batch_users'], len(user_ids))}"
+                f"/{len(user_ids)} users"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Precomputed recommendations for {len(user_ids)} users "
+            f"in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from movie.models import Playlist
+from user.models import CustomUser
+from recommendations.taste import rebuild_taste_vector
+
+
+class Command(BaseCommand):
+    help = ("Recompute user taste vectors from their playlists, "
+            "fixing any drift from incremental updates")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            dest='username',
+            help="Only rebuild the taste vector of this user",
+        )
+
+    def handle(self, *args, **options):
+        if options['username']:
+            try:
+                user_ids = [
+                    CustomUser.objects.get(username=options['username']).id
+                ]
+            except CustomUser.DoesNotExist:
+                raise CommandError(f"user {options['username']} not found.")
+        else:
+            user_ids = list(Playlist.objects.order_by().values_list(
+                    'user_id', flat=True
+            ).distinct())
+
+        model = apps.get_app_config('recommendations').get_model()
+        for user_id in user_ids:
+            rebuild_taste_vector(model, user_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {len(user_ids)} taste vectors"
+        ))
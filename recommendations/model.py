@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+from django.conf import settings
+
+from .ann import load_ivf
+from .index import MovieIndex
+from .neighbors import load_neighbors
+from .ranking import batch_top_k
+from .scoring import is_sparse, score_batch, to_dense
+from .store import (
+    MODEL_PATH,
+    artifact_version,
+    resolve_model_path,
+    has_store,
+    load_store,
+    load_pickles,
+)
+
+
+class RecommendationModel:
+    """
+    Everything loaded from one similarity model directory.
+    """
+
+    def __init__(self, movies, features, norms, neighbors=None,
+                 ann_index=None, version="", path=MODEL_PATH):
+        self.movies = movies
+        self.features = features
+        self.norms = norms
+        self.neighbors = neighbors
+        self.ann_index = ann_index
+        self.version = version
+        self.path = path
+        self.movie_index = MovieIndex(movies['Movie_id'].to_numpy())
+
+
+def load_recommendation_model(path=None):
+    if path is None:
+        path = resolve_model_path(
+            MODEL_PATH,
+            settings.RECOMMENDATIONS_MODEL_VERSION,
+        )
+    print('\n[RECOMMENDATIONS MODEL]')
+
+    if os.path.isdir(f"{path}/"):
+        print("Directory FOUND!")
+    else:
+        print("Directory NOT FOUND!")
+
+    if has_store(path):
+        movies, features, norms = load_store(path)
+        print("--feature store mapped")
+    else:
+        # Format lama, jalankan `manage.py convert_similarity_model`
+        # supaya feature matrix bisa di-share antar worker
+        movies, features, norms = load_pickles(path)
+
+    # Tabel tetangga opsional, dibuat dengan
+    # `manage.py build_similarity_neighbors`
+    neighbors = load_neighbors(path)
+    if neighbors is not None:
+        print("--neighbors.npz loaded")
+
+    ann_index = None
+    if settings.RECOMMENDATIONS_SEARCH_BACKEND == "ivf":
+        ann_index = load_ivf(path, features.shape[0])
+        if ann_index is None:
+            print("--ivf.npz NOT USABLE, using exact search")
+        else:
+            print(f"--ivf.npz loaded ({ann_index.nlist} clusters)")
+    print()
+
+    return RecommendationModel(
+        movies,
+        features,
+        norms,
+        neighbors=neighbors,
+        ann_index=ann_index,
+        version=artifact_version(path),
+        path=path,
+    )
+
+
+def recommendation_model_changed(model):
+    """
+    True if load_recommendation_model would now load something else than
+    model: CURRENT points at another version, or its files were rebuilt.
+    """
+    path = resolve_model_path(MODEL_PATH, settings.RECOMMENDATIONS_MODEL_VERSION)
+    return path != model.path or artifact_version(path) != model.version
+
+
+PAGE_SIZE = 4096
+
+
+def touch_pages(array):
+    """
+    Read one byte of every page of a (memory-mapped) array, so the OS
+    pages it in now rather than during the first request.
+    """
+    data = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+    return int(data[::PAGE_SIZE].sum())
+
+
+def warm_up_recommendation_model(model, batch_sizes, k=10):
+    """
+    Page in the feature matrix, then score dummy queries built from
+    catalog rows at each batch size, like a real recommendation would.
+    """
+    from .service import mul_recommander
+
+    features = model.features
+    if is_sparse(features):
+        for array in (features.data, features.indices, features.indptr):
+            touch_pages(array)
+    else:
+        touch_pages(features)
+    touch_pages(model.norms)
+
+    n = features.shape[0]
+    if n == 0:
+        return
+    for batch_size in batch_sizes:
+        rows = np.arange(batch_size) % n
+        if batch_size == 1:
+            mul_recommander(model, rows, k, rows)
+        else:
+            queries = to_dense(features[rows]).astype(np.float32)
+            batch_top_k(score_batch(features, queries), k)
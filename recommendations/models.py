@@ -0,0 +1,41 @@
+from django.db import models
+
+from user.models import CustomUser
+
+
+class UserTasteVector(models.Model):
+    """
+    Running sum of the feature vectors of every movie in a user's
+    playlists, so recommending only needs this one vector.
+    """
+    user = models.OneToOneField(
+            CustomUser,
+            on_delete=models.CASCADE,
+            primary_key=True,
+            related_name='taste_vector')
+    vector_sum = models.BinaryField()
+    count = models.IntegerField(default=0)
+    model_version = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} ({self.count} movies)"
+
+
+class UserRecommendation(models.Model):
+    """
+    Recommendations precomputed offline by `manage.py
+    precompute_recommendations`. Only valid while fingerprint matches the
+    user's current liked set and model version.
+    """
+    user = models.OneToOneField(
+            CustomUser,
+            on_delete=models.CASCADE,
+            primary_key=True,
+            related_name='precomputed_recommendations')
+    movies_id = models.JSONField(default=list)
+    fingerprint = models.CharField(max_length=128)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} ({len(self.movies_id)} movies)"
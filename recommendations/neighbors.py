@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+
+from .scoring import to_dense
+from .store import MODEL_PATH, load_store
+
+NEIGHBORS_FILE = 'neighbors.npz'
+
+
+class NeighborTable:
+    """
+    Top-K most similar movies for every catalog row, stored CSR-style:
+    the neighbors of row i are indices[indptr[i]:indptr[i + 1]], best first.
+    """
+
+    def __init__(self, indptr, indices, scores):
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+
+    def neighbors(self, row, k):
+        start = self.indptr[row]
+        stop = min(self.indptr[row + 1], start + k)
+        return self.indices[start:stop], self.scores[start:stop]
+
+
+def build_neighbors(features, k=50, block_size=1024):
+    """
+    Compute the top-k neighbors of every row of an L2-normalized feature
+    matrix. Rows are processed block_size at a time, so only a
+    block_size x N slice of the similarity matrix ever exists in memory.
+    """
+    n = features.shape[0]
+    k = max(min(int(k), n - 1), 0)
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        similarity = to_dense(features[start:stop] @ features.T)
+        # Film tidak boleh jadi tetangga dirinya sendiri
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        if k == 0:
+            continue
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind='stable')
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:stop] = np.take_along_axis(
+            candidate_scores, order, axis=1
+        )
+
+    indptr = (np.arange(n + 1, dtype=np.int64) * k).astype(np.int32)
+    return NeighborTable(indptr, indices.ravel(), scores.ravel())
+
+
+def save_neighbors(path, table):
+    filepath = os.path.join(path, NEIGHBORS_FILE)
+    with open(f"{filepath}.tmp", 'wb') as file:
+        np.savez(
+            file,
+            indptr=table.indptr,
+            indices=table.indices,
+            scores=table.scores,
+        )
+    os.replace(f"{filepath}.tmp", filepath)
+
+
+def load_neighbors(path=MODEL_PATH):
+    filepath = os.path.join(path, NEIGHBORS_FILE)
+    if not os.path.isfile(filepath):
+        return None
+    with np.load(filepath) as data:
+        return NeighborTable(data['indptr'], data['indices'], data['scores'])
+
+
+def build_neighbor_file(path=MODEL_PATH, k=50, block_size=1024):
+    """
+    Build neighbors.npz from the store in path. Only needs numpy and
+    pandas, so it also runs at image build time.
+    """
+    _, features, _ = load_store(path)
+    table = build_neighbors(features, k, block_size)
+    save_neighbors(path, table)
+    return table
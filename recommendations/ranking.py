@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def exclude(scores, rows):
+    """
+    Mask rows out of a score vector in place so top_k never returns them.
+    """
+    if len(rows):
+        scores[rows] = -np.inf
+    return scores
+
+
+def top_k(scores, k):
+    """
+    Return the row positions and scores of the k highest scores, best first.
+
+    Uses partial selection so only the k winners are sorted:
+    O(N + k log k) instead of a full O(N log N) argsort. Rows masked out
+    with exclude() are never returned, even if fewer than k remain.
+    """
+    scores = np.asarray(scores)
+    k = min(int(k), scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=scores.dtype)
+
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+
+    order = np.argsort(-scores[candidates], kind='stable')
+    rows = candidates[order]
+    rows = rows[scores[rows] > -np.inf]
+    return rows, scores[rows]
+
+
+def batch_top_k(scores, k):
+    """
+    top_k for every row of a 2-D score matrix at once. Returns one
+    (rows, scores) pair per score row, masked rows left out.
+    """
+    scores = np.asarray(scores)
+    k = min(int(k), scores.shape[1])
+    if k <= 0:
+        return [top_k(row, 0) for row in scores]
+
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    rows = np.take_along_axis(candidates, order, axis=1)
+    row_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    results = []
+    for user_rows, user_scores in zip(rows, row_scores):
+        keep = user_scores > -np.inf
+        results.append((user_rows[keep], user_scores[keep]))
+    return results
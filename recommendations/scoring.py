@@ -0,0 +1,66 @@
+import numpy as np
+from scipy import sparse
+
+
+def is_sparse(features):
+    return sparse.issparse(features)
+
+
+def to_dense(matrix):
+    if is_sparse(matrix):
+        return matrix.toarray()
+    return np.asarray(matrix)
+
+
+def normalize(vector):
+    if is_sparse(vector):
+        norm = np.sqrt(vector.multiply(vector).sum())
+    else:
+        norm = np.linalg.norm(vector)
+    if norm == 0:
+        return vector
+    return vector / norm
+
+
+def raw_sum(features, norms, rows):
+    """
+    Dense float64 sum of the raw (un-normalized) feature vectors of rows.
+    """
+    if is_sparse(features):
+        weights = sparse.csr_matrix(norms[rows][None, :].astype(np.float64))
+        return to_dense(weights @ features[rows]).ravel()
+    raw = features[rows] * norms[rows, None]
+    return raw.sum(axis=0, dtype=np.float64)
+
+
+def aggregate(features, norms, rows):
+    """
+    Average the raw feature vectors of the given rows and return the
+    result L2-normalized, ready to be scored against the catalog.
+
+    Sparse features stay sparse: the query is a 1 x d CSR row built with a
+    sparse weights @ rows product, never a dense d-vector.
+    """
+    if is_sparse(features):
+        weights = sparse.csr_matrix(norms[rows][None, :] / len(rows))
+        return normalize(weights @ features[rows]).astype(features.dtype)
+    raw = features[rows] * norms[rows, None]
+    return normalize(raw.mean(axis=0)).astype(features.dtype, copy=False)
+
+
+def score(features, query):
+    """
+    Cosine similarity of query against every row. The rows are already
+    L2-normalized, so this is a single matrix-vector product.
+    """
+    if is_sparse(query):
+        return to_dense(features @ query.T).ravel()
+    return np.asarray(features @ query).ravel()
+
+
+def score_batch(features, queries):
+    """
+    Cosine similarity of every row of a dense query matrix against every
+    catalog row, as one matrix multiply. Returns queries x catalog.
+    """
+    return to_dense(features @ queries.T).T
@@ -1,67 +1,215 @@
 import numpy as np
 from django.apps import apps
-from sklearn.metrics.pairwise import cosine_similarity
+from django.conf import settings
+
+from .cache import RECOMMENDATION_CACHE
+from .models import UserRecommendation
+from .ranking import batch_top_k, exclude, top_k
+from .scoring import aggregate, normalize, raw_sum, score, score_batch
+from .taste import get_taste_vector
 
 
 CONFIG = apps.get_app_config('recommendations')
-SIMILARITY = CONFIG.similarity
-FEATURES = CONFIG.features
-MOVIES = CONFIG.movies
 
 
-def mul_recommander(selected_movie_indices):
-    selected_features = FEATURES[selected_movie_indices]
-    aggregated_features = np.mean(selected_features, axis=0)
-    similarity = cosine_similarity(np.asarray(aggregated_features).
-                                   reshape(1, -1), FEATURES).flatten()
-    sorted_indices = np.argsort(similarity)[::-1]
-    recommended_movies = MOVIES.iloc[sorted_indices]
+def rank(model, query, k, excluded_indices=()):
+    """
+    Mengembalikan baris k film yang paling mirip dengan vektor query
+    (sudah dinormalisasi) beserta skornya.
+    """
+    if model.ann_index is not None:
+        # Hanya menghitung skor film di cluster terdekat
+        return model.ann_index.search(
+            model.features,
+            query,
+            k,
+            settings.RECOMMENDATIONS_IVF_NPROBE,
+            excluded_indices,
+        )
+
+    similarity = score(model.features, query)
+    exclude(similarity, excluded_indices)
+    return top_k(similarity, k)
+
+
+def mul_recommander(model, selected_movie_indices, k, excluded_indices=()):
+    """
+    Mengembalikan k Movie_id teratas beserta skor similarity-nya.
+    Baris di excluded_indices tidak akan pernah direkomendasikan.
+    """
+    aggregated_features = aggregate(
+        model.features,
+        model.norms,
+        selected_movie_indices,
+    )
+    rows, scores = rank(model, aggregated_features, k, excluded_indices)
 
-    return recommended_movies
+    return model.movie_index.ids(rows), scores
 
 
-def recommend_movies(movies_id, number):
+def recommend_movies(movies_id, number, exclude_movies_id=()):
     """
     Fungsi ini menerima daftar ID film dan jumlah film yang ingin ditampilkan.
     Akan mengembalikan dan mencetak film yang direkomendasikan.
+    Film yang dipilih dan film di exclude_movies_id (misalnya film di
+    playlist lain atau yang sudah direview) tidak ikut direkomendasikan.
     """
-    # Memeriksa ID film yang ada dalam data
-    valid_movie_ids = [
-            movie for movie in movies_id if movie in MOVIES['Movie_id'].values
-    ]
+    model = CONFIG.get_model()
+
+    # Mengambil indeks baris film yang ada dalam data,
+    # ID yang tidak dikenal langsung dibuang
+    selected_movie_indices = model.movie_index.lookup(movies_id)
 
-    if not valid_movie_ids:
+    if len(selected_movie_indices) == 0:
         print('Tidak ada film yang sesuai dengan ID yang diberikan.')
         return []
 
-    # Mengambil indeks film yang dipilih dari DataFrame movies
-    selected_movie_indices = [MOVIES[MOVIES['Movie_id'] == movie].
-                              index[0] for movie in valid_movie_ids]
+    # Film yang sudah dipilih dimasking dari hasil, jadi tidak perlu
+    # melewati sejumlah hasil pertama
+    excluded_indices = np.concatenate([
+        selected_movie_indices,
+        model.movie_index.lookup(list(exclude_movies_id)),
+    ])
 
     # Menjalankan recommender untuk mendapatkan rekomendasi
-    result = mul_recommander(selected_movie_indices)
+    result_ids, _ = mul_recommander(
+        model,
+        selected_movie_indices,
+        number,
+        excluded_indices,
+    )
+    recommended_movies_id = result_ids.tolist()
 
     # Mengambil judul dari film yang dipilih
-    selected_titles = MOVIES[MOVIES['Movie_id'].isin(movies_id)]['title']. \
-        tolist()
+    selected_titles = model.movies['title'].iloc[
+        np.unique(selected_movie_indices)
+    ].tolist()
 
     # Menampilkan judul film yang dipilih, setiap judul di baris baru
     print('Selected movies are:')
     print("\n".join(selected_titles))
     print()
 
-    # Mengambil sejumlah judul film yang direkomendasikan,
-    # mulai setelah film yang dipilih
-    # (kalo mau ngambil Movie_id bisa dirubah parameternya)
-    recommended_titles = result['title']. \
-        iloc[len(movies_id):len(movies_id) + number].tolist()
+    # Mengambil judul film yang direkomendasikan
+    recommended_titles = model.movies['title'].iloc[
+        model.movie_index.lookup(recommended_movies_id)
+    ].tolist()
 
     # Menampilkan sejumlah film yang direkomendasikan,
     # setiap judul di baris baru
     print(f'{number} recommended movies:')
     print("\n".join(recommended_titles))
 
-    recommended_movies_id = result['Movie_id']. \
-        iloc[len(movies_id):len(movies_id) + number].tolist()
+    return recommended_movies_id
+
+
+def recommend_movies_batch(movies_id_lists, number, chunk_size=256):
+    """
+    recommend_movies untuk banyak user sekaligus. Vektor semua user
+    ditumpuk jadi satu matriks dan diskor terhadap FEATURES dengan satu
+    perkalian matriks per chunk_size user, supaya memori tetap terbatas
+    (chunk_size x jumlah film).
+    Mengembalikan list Movie_id untuk setiap list di movies_id_lists.
+    """
+    model = CONFIG.get_model()
+    features, norms = model.features, model.norms
+    selected = [
+        model.movie_index.lookup(movies_id) for movies_id in movies_id_lists
+    ]
+    results = [[] for _ in movies_id_lists]
+    users = [i for i, rows in enumerate(selected) if len(rows)]
+
+    for start in range(0, len(users), chunk_size):
+        chunk = users[start:start + chunk_size]
+        queries = np.stack([
+            normalize(raw_sum(features, norms, selected[i])) for i in chunk
+        ]).astype(np.float32)
+        similarity = score_batch(features, queries)
+        for j, i in enumerate(chunk):
+            exclude(similarity[j], selected[i])
+
+        for i, (rows, _) in zip(chunk, batch_top_k(similarity, number)):
+            results[i] = model.movie_index.ids(rows).tolist()
+
+    return results
+
 
+def recommend_for_user(model, user_id, movies_id, number):
+    """
+    Rekomendasi dari taste vector user yang disimpan, jadi cukup satu
+    vektor dan satu perkalian matriks-vektor berapapun jumlah filmnya.
+    movies_id (film di playlist user) hanya dipakai untuk exclusion.
+    """
+    vector_sum, count = get_taste_vector(model, user_id)
+    if count == 0:
+        return []
+
+    query = normalize(vector_sum).astype(np.float32)
+    rows, _ = rank(model, query, number, model.movie_index.lookup(movies_id))
+    return model.movie_index.ids(rows).tolist()
+
+
+def cached_recommend_movies(user_id, movies_id, number):
+    """
+    Sama dengan recommend_for_user, tapi hasilnya disimpan per user selama
+    liked set dan versi model tidak berubah.
+    """
+    model = CONFIG.get_model()
+    key = RECOMMENDATION_CACHE.key(movies_id, number, model.version)
+    recommended_movies_id = RECOMMENDATION_CACHE.get(key)
+    if recommended_movies_id is None:
+        # Pakai hasil precompute_recommendations kalau masih berlaku
+        precomputed = UserRecommendation.objects.filter(
+                user_id=user_id,
+                fingerprint=key,
+        ).values_list('movies_id', flat=True).first()
+        if precomputed is not None:
+            recommended_movies_id = precomputed
+        else:
+            recommended_movies_id = recommend_for_user(
+                    model,
+                    user_id,
+                    movies_id,
+                    number,
+            )
+        RECOMMENDATION_CACHE.set(user_id, key, recommended_movies_id)
     return recommended_movies_id
+
+
+def similar_movies(tmdb_id, k):
+    """
+    Mengembalikan k Movie_id yang paling mirip dengan satu film beserta
+    skornya, diambil dari tabel tetangga yang sudah dihitung sebelumnya.
+    """
+    model = CONFIG.get_model()
+    row = model.movie_index.get(tmdb_id)
+    if row is None or model.neighbors is None:
+        return [], []
+
+    rows, scores = model.neighbors.neighbors(row, k)
+    return model.movie_index.ids(rows).tolist(), scores.tolist()
+
+
+def catalog_metadata(movies_id):
+    """
+    Title and poster_path of the given Movie_id straight from the loaded
+    catalog, for ids that have both. Empty if the model is not loaded or
+    the catalog has no poster_path column.
+    """
+    model = CONFIG.model.get_if_ready()
+    if model is None or 'poster_path' not in model.movies.columns:
+        return {}
+
+    rows = model.movie_index.lookup(list(movies_id))
+    movies_id = model.movie_index.ids(rows)
+    movies = model.movies.iloc[rows]
+
+    metadata = {}
+    for movie_id, title, poster_path in zip(
+            movies_id, movies['title'], movies['poster_path']):
+        if isinstance(title, str) and isinstance(poster_path, str):
+            metadata[int(movie_id)] = {
+                "title": title,
+                "poster_path": poster_path,
+            }
+    return metadata
@@ -0,0 +1,63 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from movie.models import Movie, Playlist, PlaylistMovie
+from .cache import RECOMMENDATION_CACHE
+from .taste import discard_taste_vector, update_taste_vector
+
+CONFIG = apps.get_app_config('recommendations')
+
+
+@receiver(post_save, sender=PlaylistMovie)
+@receiver(post_delete, sender=PlaylistMovie)
+def invalidate_recommendations(sender, instance, **kwargs):
+    try:
+        user_id = instance.playlist.user_id
+    except Playlist.DoesNotExist:
+        # Playlist ikut terhapus, fingerprint liked set pasti berubah
+        return
+    RECOMMENDATION_CACHE.invalidate(user_id)
+
+
+@receiver(post_save, sender=PlaylistMovie)
+def add_to_taste_vector(sender, instance, created, **kwargs):
+    if not created:
+        return
+    model = CONFIG.model.get_if_ready()
+    if model is None:
+        # Jangan tunggu model dimuat, vektor dihitung ulang saat dibaca
+        discard_taste_vector(instance.playlist.user_id)
+        return
+    update_taste_vector(
+        model,
+        instance.playlist.user_id,
+        [instance.movie.tmdb_id],
+    )
+
+
+@receiver(post_delete, sender=PlaylistMovie)
+def remove_from_taste_vector(sender, instance, **kwargs):
+    try:
+        user_id = instance.playlist.user_id
+    except Playlist.DoesNotExist:
+        return
+    model = CONFIG.model.get_if_ready()
+    if model is None:
+        discard_taste_vector(user_id)
+        return
+    try:
+        update_taste_vector(
+            model,
+            user_id,
+            [instance.movie.tmdb_id],
+            sign=-1,
+        )
+    except Movie.DoesNotExist:
+        # Tidak tahu vektor mana yang harus dikurangi, hitung ulang nanti
+        discard_taste_vector(user_id)
+
+
+@receiver(post_delete, sender=Playlist)
+def discard_taste_vector_of_playlist(sender, instance, **kwargs):
+    discard_taste_vector(instance.user_id)
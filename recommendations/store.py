@@ -0,0 +1,227 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+MODEL_PATH = os.environ.get(
+    "RECOMMENDATIONS_MODEL_DIR", 'recommendations/similarity_model'
+)
+FEATURES_FILE = 'features.npy'
+# Fitur sparse (TF-IDF / count) disimpan sebagai komponen CSR terpisah
+# supaya tetap bisa di-mmap
+SPARSE_FEATURES_FILES = {
+    'data': 'features.data.npy',
+    'indices': 'features.indices.npy',
+    'indptr': 'features.indptr.npy',
+    'shape': 'features.shape.npy',
+}
+MOVIES_FILE = 'movies.csv'
+SIDECAR_COLUMNS = ['Movie_id', 'title', 'poster_path']
+# Model bisa disimpan per versi di MODEL_PATH/<versi>/, CURRENT berisi
+# nama versi yang aktif. Tanpa CURRENT, MODEL_PATH sendiri yang dipakai.
+CURRENT_FILE = 'CURRENT'
+
+
+def current_version(base=MODEL_PATH):
+    filepath = os.path.join(base, CURRENT_FILE)
+    if not os.path.isfile(filepath):
+        return None
+    with open(filepath) as file:
+        return file.read().strip() or None
+
+
+def resolve_model_path(base=MODEL_PATH, version=None):
+    """
+    Directory of the given version, else of the CURRENT one, else base
+    itself for the unversioned layout.
+    """
+    version = version or current_version(base)
+    if version is None:
+        return base
+    return os.path.join(base, version)
+
+
+def list_versions(base=MODEL_PATH):
+    return sorted(
+        name for name in os.listdir(base)
+        if has_store(os.path.join(base, name))
+    )
+
+
+def activate_version(base, version):
+    """
+    Point CURRENT at version. The pointer is replaced atomically, so a
+    concurrent reader sees either the old or the new version.
+    """
+    if version not in list_versions(base):
+        raise ValueError(f"{version} is not a model version in {base}")
+    filepath = os.path.join(base, CURRENT_FILE)
+    with open(f"{filepath}.tmp", 'w') as file:
+        file.write(version)
+    os.replace(f"{filepath}.tmp", filepath)
+
+
+def artifact_version(path=MODEL_PATH):
+    """
+    Short fingerprint of the model files in path, changes whenever any of
+    them is rebuilt. Used to key caches derived from the model.
+    """
+    digest = hashlib.sha1()
+    for filename in sorted(os.listdir(path)):
+        stat = os.stat(os.path.join(path, filename))
+        digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def store_version(path=MODEL_PATH):
+    """
+    Fingerprint of only the feature store files in path, so indexes built
+    from the store can tell whether it changed since.
+    """
+    filenames = [FEATURES_FILE, MOVIES_FILE, *SPARSE_FEATURES_FILES.values()]
+    digest = hashlib.sha1()
+    for filename in sorted(filenames):
+        filepath = os.path.join(path, filename)
+        if os.path.isfile(filepath):
+            stat = os.stat(filepath)
+            digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+def normalize_rows(features):
+    """
+    L2-normalize every row into a contiguous float32 matrix (or a float32
+    CSR matrix if features is sparse).
+    Returns the normalized matrix and the original row norms, so the
+    raw vectors can still be recovered as normalized * norm.
+    """
+    if sparse.issparse(features):
+        features = sparse.csr_matrix(features, dtype=np.float32)
+        norms = np.sqrt(
+            np.asarray(features.multiply(features).sum(axis=1)).ravel()
+        ).astype(np.float32)
+        safe_norms = np.where(norms > 0, norms, 1).astype(np.float32)
+        normalized = sparse.diags(1 / safe_norms) @ features
+        normalized = sparse.csr_matrix(normalized, dtype=np.float32)
+        normalized.sort_indices()
+        return normalized, norms
+
+    features = np.asarray(features, dtype=np.float32)
+    norms = np.linalg.norm(features, axis=1).astype(np.float32)
+    safe_norms = np.where(norms > 0, norms, 1).astype(np.float32)
+    normalized = np.ascontiguousarray(features / safe_norms[:, None])
+    return normalized, norms
+
+
+def has_sparse_store(path=MODEL_PATH):
+    return os.path.isfile(os.path.join(path, SPARSE_FEATURES_FILES['indptr']))
+
+
+def has_store(path=MODEL_PATH):
+    return ((os.path.isfile(os.path.join(path, FEATURES_FILE))
+             or has_sparse_store(path))
+            and os.path.isfile(os.path.join(path, MOVIES_FILE)))
+
+
+def save_store(path, movies, features):
+    """
+    Write the catalog in the memory-mappable format: an L2-normalized
+    float32 features.npy plus a movies.csv sidecar with id, title and norm.
+    Sparse features are written as CSR components instead of features.npy.
+    """
+    normalized, norms = normalize_rows(features)
+    if normalized.shape[0] != len(movies):
+        raise ValueError(
+            f"features has {normalized.shape[0]} rows "
+            f"but movies has {len(movies)}"
+        )
+
+    columns = [c for c in SIDECAR_COLUMNS if c in movies.columns]
+    sidecar = movies[columns].reset_index(drop=True)
+    sidecar['norm'] = norms
+
+    # Tulis ke file sementara dulu supaya worker lain tidak pernah
+    # membaca file yang setengah jadi
+    if sparse.issparse(normalized):
+        arrays = {
+            SPARSE_FEATURES_FILES['data']: normalized.data,
+            SPARSE_FEATURES_FILES['indices']: normalized.indices,
+            SPARSE_FEATURES_FILES['indptr']: normalized.indptr,
+            SPARSE_FEATURES_FILES['shape']: np.array(normalized.shape),
+        }
+        stale = [FEATURES_FILE]
+    else:
+        arrays = {FEATURES_FILE: normalized}
+        stale = list(SPARSE_FEATURES_FILES.values())
+
+    for filename, array in arrays.items():
+        with open(os.path.join(path, f"{filename}.tmp"), 'wb') as file:
+            np.save(file, array)
+    movies_path = os.path.join(path, MOVIES_FILE)
+    sidecar.to_csv(f"{movies_path}.tmp", index=False)
+
+    for filename in arrays:
+        filepath = os.path.join(path, filename)
+        os.replace(f"{filepath}.tmp", filepath)
+    os.replace(f"{movies_path}.tmp", movies_path)
+    for filename in stale:
+        if os.path.isfile(os.path.join(path, filename)):
+            os.remove(os.path.join(path, filename))
+
+
+def load_store(path=MODEL_PATH):
+    """
+    Open the catalog saved by save_store. The feature matrix is memory
+    mapped read-only, so every worker shares the same pages through the
+    OS page cache instead of keeping a private copy.
+    """
+    if has_sparse_store(path):
+        components = {
+            name: np.load(os.path.join(path, filename), mmap_mode='r')
+            for name, filename in SPARSE_FEATURES_FILES.items()
+        }
+        features = sparse.csr_matrix(
+            (components['data'], components['indices'], components['indptr']),
+            shape=tuple(components['shape']),
+            copy=False,
+        )
+    else:
+        features = np.load(os.path.join(path, FEATURES_FILE), mmap_mode='r')
+    movies = pd.read_csv(os.path.join(path, MOVIES_FILE))
+    norms = movies.pop('norm').to_numpy(dtype=np.float32)
+    return movies, features, norms
+
+
+def read_pickles(path=MODEL_PATH):
+    loaded_data = {}
+    for name in ('movies', 'features'):
+        with open(os.path.join(path, f"{name}.pkl"), 'rb') as file:
+            loaded_data[name] = pickle.load(file)
+        print(f"--{name}.pkl loaded")
+    return loaded_data['movies'], loaded_data['features']
+
+
+def convert_pickles(path=MODEL_PATH, output=None):
+    """
+    Convert movies.pkl and features.pkl in path into the store format,
+    written to output (path itself by default).
+    Only needs numpy and pandas, so it also runs at image build time.
+    """
+    movies, features = read_pickles(path)
+    output = output or path
+    os.makedirs(output, exist_ok=True)
+    save_store(output, movies, features)
+    return len(movies)
+
+
+def load_pickles(path=MODEL_PATH):
+    """
+    Load the legacy movies.pkl and features.pkl artifacts, normalized the
+    same way as the store so both formats share one scoring path.
+    """
+    movies, features = read_pickles(path)
+    features, norms = normalize_rows(features)
+    return movies.reset_index(drop=True), features, norms
@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+
+import numpy as np
+from django.db import transaction
+
+from movie.models import PlaylistMovie
+from user.models import CustomUser
+from .models import UserTasteVector
+from .scoring import raw_sum
+
+VECTOR_DTYPE = np.dtype('<f8')
+
+
+def _sum_vectors(model, movies_id):
+    """
+    Sum of the raw feature vectors of movies_id, and how many of them are
+    in the catalog. Duplicates count once per occurrence, like HomeView.
+    """
+    rows = model.movie_index.lookup(movies_id)
+    if len(rows) == 0:
+        return np.zeros(model.features.shape[1], dtype=VECTOR_DTYPE), 0
+    vector = raw_sum(model.features, model.norms, rows)
+    return vector.astype(VECTOR_DTYPE), len(rows)
+
+
+def _read(taste):
+    return np.frombuffer(bytes(taste.vector_sum), dtype=VECTOR_DTYPE).copy()
+
+
+def _write(model, taste, vector, count):
+    taste.vector_sum = vector.astype(VECTOR_DTYPE).tobytes()
+    taste.count = count
+    taste.model_version = model.version
+    taste.save()
+
+
+def _lock_user(user_id):
+    """
+    Lock the user's row for the current transaction. Every write to a
+    taste vector takes this lock first, so rebuilds and incremental
+    updates of one user run one at a time, even while the vector row
+    does not exist yet.
+    """
+    list(CustomUser.objects.select_for_update().filter(
+            pk=user_id
+    ).values_list('pk', flat=True))
+
+
+@contextmanager
+def taste_vector_lock(user_id):
+    """
+    Transaction holding the user's taste vector lock. Add or remove a
+    user's PlaylistMovie rows inside it, so the signal handlers apply the
+    delta in the same transaction and a concurrent rebuild either sees
+    both the row and the delta or neither.
+    """
+    with transaction.atomic():
+        _lock_user(user_id)
+        yield
+
+
+def rebuild_taste_vector(model, user_id):
+    """
+    Recompute a user's taste vector from all of their playlist movies.
+    """
+    with transaction.atomic():
+        _lock_user(user_id)
+        # Playlist dibaca setelah lock, jadi update yang menunggu lock
+        # akan menambah ke vektor ini, bukan hilang
+        movies_id = list(PlaylistMovie.objects.filter(
+                playlist__user_id=user_id
+        ).values_list('movie__tmdb_id', flat=True))
+        vector, count = _sum_vectors(model, movies_id)
+
+        taste = UserTasteVector(user_id=user_id)
+        _write(model, taste, vector, count)
+    return vector, count
+
+
+def update_taste_vector(model, user_id, movies_id, sign=1):
+    """
+    Add (sign=1) or remove (sign=-1) movies from a user's taste vector
+    in O(d), without reading the rest of their library.
+
+    Must run in the transaction that inserted or deleted the playlist
+    rows (see taste_vector_lock). Outside of one the change is already
+    committed, a concurrent rebuild may have counted it, so the vector is
+    discarded instead.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        discard_taste_vector(user_id)
+        return
+
+    delta, count = _sum_vectors(model, movies_id)
+    if count == 0:
+        return
+
+    with transaction.atomic():
+        _lock_user(user_id)
+        taste = UserTasteVector.objects.select_for_update().filter(
+                user_id=user_id
+        ).first()
+        if taste is None:
+            # Akan dihitung lengkap saat pertama kali dibaca
+            return
+        if taste.model_version != model.version:
+            taste.delete()
+            return
+        _write(model, taste, _read(taste) + sign * delta, taste.count + sign * count)
+
+
+def get_taste_vector(model, user_id):
+    """
+    Return a user's (vector_sum, count), rebuilding it if it is missing
+    or was built for another model version.
+    """
+    taste = UserTasteVector.objects.filter(user_id=user_id).first()
+    if taste is None or taste.model_version != model.version:
+        return rebuild_taste_vector(model, user_id)
+    return _read(taste), taste.count
+
+
+def discard_taste_vector(user_id):
+    # Lewat lock juga, supaya rebuild yang sedang berjalan tidak menulis
+    # vektor lama setelah dibuang
+    with transaction.atomic():
+        _lock_user(user_id)
+        UserTasteVector.objects.filter(user_id=user_id).delete()
@@ -0,0 +1,70 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from .ranking import batch_top_k, exclude, top_k
+
+
+class TopKTests(SimpleTestCase):
+
+    def test_returns_highest_scores_best_first(self):
+        rows, scores = top_k(np.array([0.1, 0.9, 0.5, 0.7]), 2)
+        self.assertEqual(rows.tolist(), [1, 3])
+        self.assertEqual(scores.tolist(), [0.9, 0.7])
+
+    def test_ties_keep_row_order(self):
+        rows, _ = top_k(np.array([0.5, 0.9, 0.5, 0.5]), 4)
+        self.assertEqual(rows.tolist(), [1, 0, 2, 3])
+        rows, _ = top_k(np.array([0.9, 0.5, 0.5, 0.1]), 3)
+        self.assertEqual(rows.tolist(), [0, 1, 2])
+
+    def test_k_larger_than_rows(self):
+        rows, scores = top_k(np.array([0.2, 0.8, 0.5]), 10)
+        self.assertEqual(rows.tolist(), [1, 2, 0])
+        self.assertEqual(len(scores), 3)
+
+    def test_k_zero(self):
+        rows, scores = top_k(np.array([0.2, 0.8]), 0)
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(len(scores), 0)
+
+    def test_excluded_rows_are_never_returned(self):
+        scores = exclude(np.array([0.9, 0.8, 0.7, 0.6]), [0, 2])
+        rows, _ = top_k(scores, 2)
+        self.assertEqual(rows.tolist(), [1, 3])
+
+    def test_fewer_than_k_left_after_exclude(self):
+        scores = exclude(np.array([0.9, 0.8, 0.7]), [0, 1])
+        rows, _ = top_k(scores, 3)
+        self.assertEqual(rows.tolist(), [2])
+
+    def test_exclude_nothing(self):
+        scores = np.array([0.3, 0.1])
+        self.assertIs(exclude(scores, []), scores)
+        self.assertEqual(scores.tolist(), [0.3, 0.1])
+
+
+class BatchTopKTests(SimpleTestCase):
+
+    def test_matches_top_k_per_row(self):
+        scores = np.random.default_rng(0).random((5, 50))
+        for k in (1, 7, 50, 80):
+            for row, (rows, row_scores) in zip(scores, batch_top_k(scores, k)):
+                expected_rows, expected_scores = top_k(row, k)
+                self.assertEqual(rows.tolist(), expected_rows.tolist())
+                self.assertEqual(row_scores.tolist(), expected_scores.tolist())
+
+    def test_ties_keep_row_order(self):
+        results = batch_top_k(np.array([[0.5, 0.5, 0.9, 0.5]]), 4)
+        self.assertEqual(results[0][0].tolist(), [2, 0, 1, 3])
+
+    def test_excluded_rows_are_dropped_per_row(self):
+        scores = np.array([[0.9, 0.8, 0.7], [0.1, 0.2, 0.3]])
+        exclude(scores[0], [0, 1])
+        exclude(scores[1], [2])
+        results = batch_top_k(scores, 2)
+        self.assertEqual(results[0][0].tolist(), [2])
+        self.assertEqual(results[1][0].tolist(), [1, 0])
+
+    def test_k_zero(self):
+        results = batch_top_k(np.ones((2, 3)), 0)
+        self.assertEqual([len(rows) for rows, _ in results], [0, 0])
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import reloadModel
+
+urlpatterns = [
+    path('reload/', reloadModel, name='reload-recommendations-model'),
+]
@@ -0,0 +1,53 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+import os
+
+from django.apps import apps
+
+from .model import load_recommendation_model
+from .store import MODEL_PATH, activate_version, list_versions
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def reloadModel(request):
+    """
+    Load the CURRENT (or the given) similarity model version next to the
+    one being served and swap to it without a restart. Only this process
+    swaps right away, the other workers follow within
+    RECOMMENDATIONS_MODEL_CHECK_SECONDS.
+    """
+    version = request.data.get('version')
+    lazy_model = apps.get_app_config('recommendations').model
+    try:
+        if version:
+            # Hanya nama direktori versi yang ada, bukan path bebas
+            if version not in list_versions(MODEL_PATH):
+                raise ValueError(f"{version} is not a model version.")
+            path = os.path.join(MODEL_PATH, version)
+            model = lazy_model.reload(
+                lambda: load_recommendation_model(path)
+            )
+            # Baru dijadikan CURRENT setelah berhasil dimuat
+            activate_version(MODEL_PATH, version)
+        else:
+            model = lazy_model.reload()
+        return Response({
+            "error": False,
+            "message": "Successfully reloaded recommendation model.",
+            "path": model.path,
+            "version": model.version,
+        }, status.HTTP_200_OK)
+    except ValueError as error:
+        return Response({
+            "error": True,
+            "message": str(error),
+        }, status.HTTP_400_BAD_REQUEST)
+    except Exception:
+        return Response({
+            "error": True,
+            "message": "An error has occured, still serving the old model.",
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR)